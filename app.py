@@ -1,29 +1,237 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, abort, jsonify, request
 from flask_cors import CORS
 from simulation import GameState, GRID_WIDTH, GRID_HEIGHT, NUM_ENGINEERS, ENGINEER_EMOJIS, ENGINEER_NAMES
+from sessions import DEFAULT_SESSION, Session, SessionManager
+from ticker import TickScheduler
+from leaderboard import leaderboard
+from outputs import results_store
+from metrics import SERVER_METRICS
+from bot_workers import shared_pool, shared_pool_started
 
 app = Flask(__name__)
 CORS(app)
 
-game_state = GameState()
+# Every game is a session with its own lock; the un-prefixed routes address the 'default' session
+sessions = SessionManager(game_factory=lambda **kwargs: GameState(metrics=SERVER_METRICS, **kwargs))
+# Advances every session created with a tick_rate; clients of those sessions only read snapshots
+scheduler = TickScheduler(sessions)
+# The default game ticks on the server at the pace the React client polls it
+DEFAULT_TICK_RATE = 2.0
+# Upper bound on entity turns a single /step request may run
+MAX_STEP_TURNS = 10000
 
-@app.route('/update', methods=['GET'])
-def update_game():
-    update_occurred = game_state.update()
-    return jsonify({"update_occurred": update_occurred, **game_state.to_dict()})
+
+def get_session(session_id: str) -> Session:
+    scheduler.start()
+    if session_id == DEFAULT_SESSION:
+        return sessions.get_or_create(session_id, tick_rate=DEFAULT_TICK_RATE)
+    session = sessions.get(session_id)
+    if session is None:
+        abort(404)
+    return session
+
+
+def publish_state(session: Session):
+    """Encode the current state once and hand the bytes to every spectator. Call with session.lock held."""
+    session.spectators.publish(session.history.full_bytes(session.game_state))
+
+
+@app.route('/games', methods=['POST'])
+def create_game():
+    """Start a new session.
+
+    An optional JSON body may give a `seed` and a `tick_rate`: ticks per
+    second for the server to run the game at, 0 for as fast as possible
+    (headless), or null (the default) to advance it with /update and /step.
+    `isolated: true` runs the bots in worker processes with a per-move
+    deadline, so a hung or crashing bot only loses its move.
+    `simultaneous: true` moves every engineer at once each round.
+    """
+    options = request.get_json(silent=True) or {}
+    tick_rate = options.get('tick_rate')
+    if tick_rate is not None and (not isinstance(tick_rate, (int, float)) or tick_rate < 0):
+        abort(400)
+    bot_executor = shared_pool() if options.get('isolated') else None
+    session = sessions.create(seed=options.get('seed'), tick_rate=tick_rate, headless=tick_rate == 0,
+                              bot_executor=bot_executor, simultaneous=bool(options.get('simultaneous')))
+    if tick_rate is not None:
+        return jsonify({"session_id": session.session_id, **session.history.latest_full()})
+    with session.lock:
+        return jsonify({"session_id": session.session_id, **session.history.full(session.game_state)})
+
+
+@app.route('/update', methods=['GET'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/update', methods=['GET'])
+def update_game(session_id):
+    """Advance a manual game by one throttled turn; for a server-ticked game, return its latest snapshot.
+
+    For a server-ticked game, `update_occurred` is False when the client's
+    `game` and `since` name the snapshot it already has, and `paused` says
+    whether the server has stopped ticking it.
+    """
+    session = get_session(session_id)
+    if session.tick_rate is not None:
+        snapshot = session.history.latest_full()
+        seen = (request.args.get('game') == snapshot['game'] and
+                request.args.get('since', type=int) == snapshot['version'])
+        return jsonify({"update_occurred": not seen, "paused": session.paused, **snapshot})
+    with session.lock:
+        update_occurred = session.game_state.update()
+        if update_occurred and session.has_spectators():
+            publish_state(session)
+        return jsonify({"update_occurred": update_occurred, **session.history.full(session.game_state)})
+
+
+@app.route('/step', methods=['GET', 'POST'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/step', methods=['GET', 'POST'])
+def step_game(session_id):
+    """Advance several entity turns in one request.
+
+    Query parameters: `turns` (entity turns), `rounds` (full rounds) or
+    `to_end=1`, plus `frames=1` to also return a compact frame after every
+    turn for local playback. Frame layout is described in GameState.frame.
+    A server-ticked game can only be stepped while paused.
+    """
+    turns = request.args.get('turns', type=int)
+    rounds = request.args.get('rounds', type=int)
+    to_end = request.args.get('to_end', '0') == '1'
+    with_frames = request.args.get('frames', '0') == '1'
+    if not to_end and turns is None and rounds is None:
+        turns = 1
+    budget = MAX_STEP_TURNS if turns is None else max(0, min(turns, MAX_STEP_TURNS))
+
+    session = get_session(session_id)
+    if session.tick_rate is not None and not session.paused:
+        return jsonify({"error": "this game is advanced by the server; pause it to step it"}), 409
+    frames = []
+    steps = 0
+    with session.lock:
+        game_state = session.game_state
+        last_round = None if rounds is None else game_state.turn_counter + rounds
+        while steps < budget:
+            if last_round is not None and game_state.turn_counter >= last_round:
+                break
+            if not game_state.step():
+                break
+            steps += 1
+            if with_frames:
+                frames.append(game_state.frame())
+        if steps and session.has_spectators():
+            publish_state(session)
+        response = {"steps": steps, **session.history.full(game_state)}
+    if with_frames:
+        response["frames"] = frames
+    return jsonify(response)
 
 
 
 # Add a new /reset route
-@app.route('/reset', methods=['POST'])
-def reset():
-    global game_state
-    game_state = GameState()
-    return jsonify(game_state.to_dict())
+@app.route('/reset', methods=['POST'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/reset', methods=['POST'])
+def reset(session_id):
+    session = get_session(session_id)
+    with session.lock:
+        session.game_state = sessions.game_factory(headless=session.tick_rate == 0,
+                                                   bot_executor=session.game_state.bot_executor,
+                                                   simultaneous=session.game_state.simultaneous)
+        if session.has_spectators():
+            publish_state(session)
+        if session.tick_rate is None:
+            return jsonify(session.history.full(session.game_state))
+    # A finished or paused game has left the schedule, so the new one must rejoin it
+    scheduler.resume(session)
+    return jsonify(session.history.latest_full())
+
+
+@app.route('/pause', methods=['POST'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/pause', methods=['POST'])
+def pause(session_id):
+    """Stop the server ticking a game, e.g. for a client's pause button; /step still advances it."""
+    session = get_session(session_id)
+    if session.tick_rate is None:
+        return jsonify({"error": "this game only advances when its clients step it"}), 409
+    scheduler.pause(session)
+    return jsonify({"paused": True, **session.history.latest_full()})
+
+
+@app.route('/resume', methods=['POST'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/resume', methods=['POST'])
+def resume(session_id):
+    session = get_session(session_id)
+    if session.tick_rate is None:
+        return jsonify({"error": "this game only advances when its clients step it"}), 409
+    scheduler.resume(session)
+    return jsonify({"paused": False, **session.history.latest_full()})
+
+@app.route('/stream', methods=['GET'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/stream', methods=['GET'])
+def stream(session_id):
+    """Server-Sent Events feed of the game state, one `state` event per tick."""
+    session = get_session(session_id)
+    spectators = session.spectators
+    if spectators.latest() is None:
+        if session.tick_rate is None:
+            with session.lock:
+                publish_state(session)
+        else:
+            spectators.publish(session.history.latest_bytes(None, None))
+
+    def events():
+        for message in spectators.subscribe():
+            yield message if message is not None else b': keepalive\n\n'
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Bot ratings over every recorded game, best first, with each bot's mean score."""
+    standings = leaderboard().standings()
+    totals = results_store().totals()
+    for row in standings:
+        row['mean_score'] = round(totals[row['name']]['mean'], 2) if row['name'] in totals else None
+    return jsonify(standings)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """AI call and game phase latency histograms for every hosted game, in Prometheus text format."""
+    body = SERVER_METRICS.prometheus()
+    if shared_pool_started():
+        body += shared_pool().prometheus()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/state', methods=['GET'], defaults={'session_id': DEFAULT_SESSION})
+@app.route('/games/<session_id>/state', methods=['GET'])
+def get_state(session_id):
+    """Full state, or with `since=<version>&game=<token>` only the fields changed after that version.
 
-@app.route('/state', methods=['GET'])
-def get_state():
-    return jsonify(game_state.to_dict())
+    Responses carry a weak ETag per game version, so a repeat poll at an
+    unchanged version with If-None-Match gets 304 Not Modified. Finished
+    games that were evicted are served from the archive.
+    """
+    if session_id == DEFAULT_SESSION:
+        session = get_session(session_id)
+    else:
+        session = sessions.get(session_id)
+        if session is None:
+            archived = sessions.archive_dir and SessionManager.load_archived(sessions.archive_dir, session_id)
+            if not archived:
+                abort(404)
+            return jsonify({"archived": True, **archived})
+    since = request.args.get('since', type=int)
+    history = session.history
+    if session.tick_rate is None:
+        with session.lock:
+            # Bring the history up to the live game before reading its newest snapshot
+            history.sync(session.game_state)
+    etag = history.latest_etag()
+    if request.if_none_match.contains_weak(etag):
+        body = b''
+    else:
+        body = history.latest_bytes(since, request.args.get('game'))
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -34,4 +242,4 @@ if __name__ == '__main__':
 #     for _ in range(100):
 
 #         game.update()
-#         print(game.to_dict())
\ No newline at end of file
+#         print(game.to_dict())
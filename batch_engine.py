@@ -0,0 +1,375 @@
+import functools
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game_config import BEAST_WANDER, DEFAULT_CONFIG, GameConfig, beast_moves_at, beast_schedule
+from bot_registry import bot_arity, default_roster
+from bot_cache import bot_cache
+from simulation import Direction, GamePhase, GameState, accepts_rng, memoizable, spiral_turns
+from engineer_functions import randomy_savage, edgy_engineer, leeroy
+
+# Directions are stored as their enum values; 0 means stay put
+STAY = 0
+UP, DOWN, LEFT, RIGHT = Direction.UP.value, Direction.DOWN.value, Direction.LEFT.value, Direction.RIGHT.value
+DX = np.array([0, 0, 0, -1, 1])
+DY = np.array([0, -1, 1, 0, 0])
+DIRECTION_CODES = {'up': UP, 'down': DOWN, 'left': LEFT, 'right': RIGHT}
+# Spiral search turns clockwise, and widens after turning out of UP or DOWN
+SPIRAL_TURN = np.array([STAY, RIGHT, LEFT, UP, DOWN])
+SPIRAL_WIDENS = np.array([0, 1, 1, 0, 0])
+
+
+@functools.lru_cache(maxsize=None)
+def spiral_exits(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """simulation.spiral_turns as arrays indexed [y * width + x, heading]: the heading to leave on, and the growth."""
+    exits = np.tile(np.arange(5), (width * height, 1))
+    widens = np.zeros((width * height, 5), dtype=np.int64)
+    for ((x, y), heading), (direction, widened) in spiral_turns(width, height).items():
+        exits[y * width + x, heading.value] = direction.value
+        widens[y * width + x, heading.value] = widened
+    return exits, widens
+
+SETUP, BEAST_VISIBLE, GAME_OVER = GamePhase.SETUP.value, GamePhase.BEAST_VISIBLE.value, GamePhase.GAME_OVER.value
+
+
+class BatchGameState:
+    """K games stepped in lockstep, mirroring GameState one entity turn at a time.
+
+    Entity 0 is the beast and entity j + 1 is engineer j of the roster. Every
+    game shares the turn counter and the current entity index; finished games
+    drop out of the `active` mask and stop changing.
+
+    With `check_bots`, every vectorized bot that draws no randomness is also
+    asked through its reference function, and `bot_mismatches` counts the
+    moves where the two disagree.
+    """
+
+    def __init__(self, num_games: int, seed: Optional[int] = None, roster: Optional[List[Tuple[str, str, callable]]] = None,
+                 config: Optional[GameConfig] = None, memoize: bool = False, check_bots: bool = False):
+        self.num_games = num_games
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.beast_schedule = beast_schedule(self.config)
+        self.width, self.height = self.config.grid_size
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = np.random.default_rng(self.seed)
+        # Bots without an array implementation are called per game and draw from this stream
+        self.py_rng = random.Random(self.seed)
+        self.roster = list(roster) if roster is not None else default_roster()
+        self.num_engineers = len(self.roster)
+        self.engineer_moves = [VECTORIZED_BOTS.get(ai_func) for _, _, ai_func in self.roster]
+        # As GameState's memoize: pure bots called per game go through their shared cache
+        self.memoize = memoize
+        self.bot_functions = [bot_cache(ai_func) if memoize and memoizable(ai_func) else ai_func
+                              for _, _, ai_func in self.roster]
+        self.bot_mismatches = {name: 0 for (name, _, ai_func), vectorized in zip(self.roster, self.engineer_moves)
+                               if check_bots and vectorized is not None and not accepts_rng(ai_func)}
+
+        games, engineers = num_games, self.num_engineers
+        self.x = np.zeros((games, engineers + 1), dtype=np.int64)
+        self.y = np.zeros((games, engineers + 1), dtype=np.int64)
+        self.x[:, 1:] = self.rng.integers(0, self.width, (games, engineers))
+        self.y[:, 1:] = self.rng.integers(0, self.height, (games, engineers))
+        self.place_beasts()
+
+        self.is_zombie = np.zeros((games, engineers), dtype=bool)
+        self.scores = np.zeros((games, engineers), dtype=np.int64)
+        self.last_moved = np.zeros((games, engineers), dtype=np.int64)
+        self.score_counter = np.ones(games, dtype=np.int64)
+        self.phase = np.full(games, SETUP)
+        self.active = np.ones(games, dtype=bool)
+        self.turns = np.zeros(games, dtype=np.int64)
+        self.turn_counter = 0
+        self.current_turn_index = 0
+        # detected_turn[g, h, j]: turn hunter h first saw engineer j, or -1
+        self.detected_turn = np.full((games, engineers + 1, engineers), -1, dtype=np.int64)
+        # Every hunter has its own spiral search; column 0 is the beast's, column j + 1 engineer j's once a zombie
+        self.spiral_direction = np.full((games, engineers + 1), RIGHT)
+        self.spiral_steps = np.ones((games, engineers + 1), dtype=np.int64)
+        self.steps_taken = np.zeros((games, engineers + 1), dtype=np.int64)
+
+    def place_beasts(self):
+        pending = np.ones(self.num_games, dtype=bool)
+        while pending.any():
+            count = int(pending.sum())
+            self.x[pending, 0] = self.rng.integers(0, self.width, count)
+            self.y[pending, 0] = self.rng.integers(0, self.height, count)
+            on_engineer = ((self.x[:, 1:] == self.x[:, :1]) & (self.y[:, 1:] == self.y[:, :1])).any(axis=1)
+            pending &= on_engineer
+
+    def step(self) -> bool:
+        active = self.active.copy()
+        if not active.any():
+            return False
+
+        index = self.current_turn_index
+        if index == 0:
+            self.update_beast(active)
+        else:
+            engineer = index - 1
+            self.update_zombies(engineer, active & self.is_zombie[:, engineer])
+            self.update_engineers(engineer, active & ~self.is_zombie[:, engineer])
+        self.check_collisions(active)
+        self.update_game_phase(active)
+
+        self.current_turn_index = (index + 1) % (self.num_engineers + 1)
+        if self.current_turn_index == 0:
+            self.turn_counter += 1
+            self.turns[active] = self.turn_counter
+        return True
+
+    def run(self, max_rounds: Optional[int] = None) -> List[Dict]:
+        last_round = None if max_rounds is None else self.turn_counter + max_rounds
+        while last_round is None or self.turn_counter < last_round:
+            if not self.step():
+                break
+        return self.results()
+
+    def move(self, entity: int, mask: np.ndarray, directions: np.ndarray):
+        new_x = self.x[:, entity] + DX[directions]
+        new_y = self.y[:, entity] + DY[directions]
+        moved = mask & (new_x >= 0) & (new_x < self.width) & (new_y >= 0) & (new_y < self.height)
+        self.x[moved, entity] = new_x[moved]
+        self.y[moved, entity] = new_y[moved]
+
+    def update_beast(self, active: np.ndarray):
+        turn = self.turn_counter
+        if turn < self.config.beast_movement[0]:
+            return
+        moves = self.beast_schedule[turn] if turn < len(self.beast_schedule) else beast_moves_at(self.config, turn)
+        for move in moves:
+            if move == BEAST_WANDER:
+                directions = self.rng.integers(1, 5, self.num_games)
+            else:
+                directions = self.hunter_ai(0, active)
+            self.move(0, active, directions)
+
+        if turn >= self.config.beast_appears:
+            self.phase[active] = BEAST_VISIBLE
+
+    def update_zombies(self, engineer: int, zombies: np.ndarray):
+        ready = zombies & (self.turn_counter - self.last_moved[:, engineer] >= 2)
+        if ready.any():
+            self.move(engineer + 1, ready, self.hunter_ai(engineer + 1, ready))
+            self.last_moved[ready, engineer] = self.turn_counter
+
+    def update_engineers(self, engineer: int, mask: np.ndarray):
+        if not mask.any():
+            return
+        vectorized = self.engineer_moves[engineer]
+        if vectorized is not None:
+            directions = vectorized(self, engineer)
+            name = self.roster[engineer][0]
+            if name in self.bot_mismatches:
+                reference = self.call_bot(engineer, mask)
+                self.bot_mismatches[name] += int((mask & (directions != reference)).sum())
+        else:
+            directions = self.call_bot(engineer, mask)
+        self.move(engineer + 1, mask, directions)
+
+    def call_bot(self, engineer: int, mask: np.ndarray) -> np.ndarray:
+        _, _, ai_func = self.roster[engineer]
+        call = self.bot_functions[engineer]
+        bot_kwargs = {'rng': self.py_rng} if accepts_rng(ai_func) else {}
+        directions = np.zeros(self.num_games, dtype=np.int64)
+        for game in np.flatnonzero(mask):
+            xs, ys, zombies = self.x[game].tolist(), self.y[game].tolist(), self.is_zombie[game].tolist()
+            beast_positions = [(xs[0], ys[0])] + [(xs[k + 1], ys[k + 1]) for k in range(self.num_engineers) if zombies[k]]
+            other_engineers = [(xs[k + 1], ys[k + 1]) for k in range(self.num_engineers) if k != engineer]
+            args = ((xs[engineer + 1], ys[engineer + 1]), beast_positions, other_engineers, (self.width, self.height))
+            if bot_arity(ai_func) > 4:
+                args += (self.turn_counter,)
+            directions[game] = direction_code(call(*args, **bot_kwargs))
+        return directions
+
+    def hunter_ai(self, hunter: int, mask: np.ndarray) -> np.ndarray:
+        """Vectorised GameState.beast_ai for entity `hunter` in the masked games."""
+        radius = self.config.beast_detection_radius if hunter == 0 else self.config.zombie_detection_radius
+        hunter_x, hunter_y = self.x[:, hunter], self.y[:, hunter]
+        engineer_x, engineer_y = self.x[:, 1:], self.y[:, 1:]
+        distance_sq = (engineer_x - hunter_x[:, None]) ** 2 + (engineer_y - hunter_y[:, None]) ** 2
+        in_range = ~self.is_zombie & (distance_sq <= radius * radius)
+
+        # Keep the turn each engineer was first seen and forget those out of range
+        detected = self.detected_turn[:, hunter, :]
+        detected[mask[:, None] & in_range & (detected < 0)] = self.turn_counter
+        detected[mask[:, None] & ~in_range] = -1
+
+        directions = np.zeros(self.num_games, dtype=np.int64)
+        chasing = mask & in_range.any(axis=1)
+        if chasing.any():
+            # Most recently detected first; ties go to the earliest engineer, like the stable sort
+            target = np.where(in_range, detected, -1).argmax(axis=1)
+            rows = np.arange(self.num_games)
+            dx = engineer_x[rows, target] - hunter_x
+            dy = engineer_y[rows, target] - hunter_y
+            chase = np.where(np.abs(dx) > np.abs(dy), np.where(dx > 0, RIGHT, LEFT), np.where(dy > 0, DOWN, UP))
+            directions[chasing] = chase[chasing]
+
+        searching = mask & ~chasing
+        if searching.any():
+            directions[searching] = self.spiral(hunter, searching)[searching]
+        return directions
+
+    def spiral(self, hunter: int, mask: np.ndarray) -> np.ndarray:
+        direction = self.spiral_direction[:, hunter]
+        steps, taken = self.spiral_steps[:, hunter], self.steps_taken[:, hunter]
+        exits, widens = spiral_exits(self.width, self.height)
+        games = np.flatnonzero(mask)
+        cells = self.y[games, hunter] * self.width + self.x[games, hunter]
+        headings = direction[games]
+        blocked = exits[cells, headings] != headings
+        if blocked.any():
+            cells, headings, games_blocked = cells[blocked], headings[blocked], games[blocked]
+            steps[games_blocked] += widens[cells, headings]
+            taken[games_blocked] = 0
+            direction[games_blocked] = exits[cells, headings]
+
+        taken[games] += 1
+        leg_done = games[taken[games] == steps[games]]
+        current = direction[leg_done]
+        taken[leg_done] = 0
+        steps[leg_done] += SPIRAL_WIDENS[current]
+        direction[leg_done] = SPIRAL_TURN[current]
+        return direction.copy()
+
+    def check_collisions(self, active: np.ndarray):
+        engineer_x, engineer_y = self.x[:, 1:], self.y[:, 1:]
+        beast_visible = self.phase == BEAST_VISIBLE
+        for engineer in range(self.num_engineers):
+            live = active & ~self.is_zombie[:, engineer]
+            if not live.any():
+                continue
+            ex, ey = engineer_x[:, engineer], engineer_y[:, engineer]
+            on_beast = beast_visible & (ex == self.x[:, 0]) & (ey == self.y[:, 0])
+            on_zombie = (self.is_zombie & (engineer_x == ex[:, None]) & (engineer_y == ey[:, None])).any(axis=1)
+            caught = live & (on_beast | on_zombie)
+            if caught.any():
+                self.is_zombie[caught, engineer] = True
+                self.scores[caught, engineer] = self.score_counter[caught]
+                self.score_counter[caught] += 1
+
+    def update_game_phase(self, active: np.ndarray):
+        if self.turn_counter == self.config.beast_appears:
+            self.phase[active] = BEAST_VISIBLE
+            return
+        survivors = (~self.is_zombie).sum(axis=1)
+        over = active & ((survivors <= 1) | (self.turn_counter >= self.config.end_game_turns))
+        if over.any():
+            self.phase[over] = GAME_OVER
+            self.end_game(over)
+
+    def end_game(self, over: np.ndarray):
+        survived = over[:, None] & ~self.is_zombie
+        self.scores += survived * (self.score_counter[:, None] + 2)
+        self.active[over] = False
+
+    def results(self) -> List[Dict]:
+        names = [name for name, _, _ in self.roster]
+        results = []
+        for game in range(self.num_games):
+            scores = self.scores[game].tolist()
+            zombies = self.is_zombie[game].tolist()
+            # Zombie scores count up from 1 in the order engineers were caught
+            order = sorted((scores[k], names[k]) for k in range(self.num_engineers) if zombies[k])
+            results.append({
+                'scores': dict(zip(names, scores)),
+                'zombie_order': [name for _, name in order],
+                'turns': int(self.turns[game]),
+                'game_over': not self.active[game],
+            })
+        return results
+
+
+def direction_code(direction) -> int:
+    if isinstance(direction, Direction):
+        return direction.value
+    if isinstance(direction, str):
+        return DIRECTION_CODES.get(direction.lower(), STAY)
+    return STAY
+
+
+def random_moves(batch: BatchGameState, engineer: int) -> np.ndarray:
+    return batch.rng.integers(1, 5, batch.num_games)
+
+
+def edgy_moves(batch: BatchGameState, engineer: int) -> np.ndarray:
+    x, y = batch.x[:, engineer + 1], batch.y[:, engineer + 1]
+    max_x, max_y = batch.width - 1, batch.height - 1
+    return np.select(
+        [
+            (x != 0) & (x != max_x) & (y != 0) & (y != max_y),
+            (y == max_y) & (x != max_x),
+            (x == max_x) & (y != 0),
+            (y == 0) & (x != 0),
+            (x == 0) & (y != max_y),
+        ],
+        [DOWN, RIGHT, UP, LEFT, DOWN],
+        default=STAY,
+    )
+
+
+LEEROY_MOVES = np.array([UP, RIGHT, DOWN, LEFT, STAY])
+
+
+def leeroy_moves(batch: BatchGameState, engineer: int) -> np.ndarray:
+    x, y = batch.x[:, engineer + 1], batch.y[:, engineer + 1]
+    # Threats are the beast then zombies in roster order; argmin keeps the first of equals like min()
+    is_threat = np.concatenate([np.ones((batch.num_games, 1), dtype=bool), batch.is_zombie], axis=1)
+    threat_distance = np.where(is_threat, (batch.x - x[:, None]) ** 2 + (batch.y - y[:, None]) ** 2, np.iinfo(np.int64).max)
+    closest = threat_distance.argmin(axis=1)
+    rows = np.arange(batch.num_games)
+    closest_x, closest_y = batch.x[rows, closest], batch.y[rows, closest]
+
+    move_x = x[:, None] + DX[LEEROY_MOVES]
+    move_y = y[:, None] + DY[LEEROY_MOVES]
+    valid = (move_x >= 0) & (move_x < batch.width) & (move_y >= 0) & (move_y < batch.height)
+    move_distance = (move_x - closest_x[:, None]) ** 2 + (move_y - closest_y[:, None]) ** 2
+    if batch.turn_counter < 10:
+        best = np.where(valid, move_distance, -1).argmax(axis=1)
+    else:
+        best = np.where(valid, move_distance, np.iinfo(np.int64).max).argmin(axis=1)
+    return LEEROY_MOVES[best]
+
+
+# Array implementations of built-in bots, keyed by the reference function
+VECTORIZED_BOTS = {
+    randomy_savage: random_moves,
+    edgy_engineer: edgy_moves,
+    leeroy: leeroy_moves,
+}
+
+
+def run_batch(num_games: int, seed: Optional[int] = None, roster: Optional[List[Tuple[str, str, callable]]] = None,
+              config: Optional[GameConfig] = None, memoize: bool = False) -> List[Dict]:
+    return BatchGameState(num_games, seed=seed, roster=roster, config=config, memoize=memoize).run()
+
+
+def equivalence_report(num_games: int = 2000, seed: int = 0, roster: Optional[List[Tuple[str, str, callable]]] = None,
+                       config: Optional[GameConfig] = None) -> Dict[str, Dict[str, float]]:
+    """Compare per-bot mean scores between the batch engine and the reference GameState.
+
+    The engines use different random streams, so results agree in distribution
+    rather than game by game. `z` is the difference in means over its standard error.
+    `mismatches` counts the batch's moves for a bot that differ from its reference
+    function on the same state; None for bots that aren't vectorized or draw randomness.
+    """
+    batch = BatchGameState(num_games, seed=seed, roster=roster, config=config, check_bots=True)
+    batch_results = batch.run()
+    reference_results = [GameState(headless=True, seed=seed + i, roster=roster, config=config).run_to_completion()
+                         for i in range(num_games)]
+
+    report = {}
+    for name in batch_results[0]['scores']:
+        batch_scores = np.array([r['scores'][name] for r in batch_results], dtype=float)
+        reference_scores = np.array([r['scores'][name] for r in reference_results], dtype=float)
+        error = math.sqrt(batch_scores.var() / num_games + reference_scores.var() / num_games) or 1.0
+        report[name] = {
+            'batch_mean': float(batch_scores.mean()),
+            'reference_mean': float(reference_scores.mean()),
+            'z': float((batch_scores.mean() - reference_scores.mean()) / error),
+            'mismatches': batch.bot_mismatches.get(name),
+        }
+    return report
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import './App.css';
 import { Clock, Pause, Play, RotateCcw, ArrowRight, Table } from 'lucide-react';
 
@@ -27,12 +27,20 @@ export default function App() {
   const GRID_HEIGHT = gameState.grid_size[1];
 
   const [showResults, setShowResults] = useState(false);
+  // The snapshot last shown, so a server-ticked game only reports an update after a new tick
+  const lastSeen = useRef(null);
 
   const fetchGameState = useCallback(async () => {
     if (isPaused) return;
     try {
-      const response = await fetch('http://localhost:5000/update');
+      const seen = lastSeen.current;
+      const query = seen ? `?game=${seen.game}&since=${seen.version}` : '';
+      const response = await fetch(`http://localhost:5000/update${query}`);
       const data = await response.json();
+      lastSeen.current = { game: data.game, version: data.version };
+      if (data.paused) {
+        setIsPaused(true);
+      }
       if (data.update_occurred) {
         setGameState(data);
         setElapsedTime(prevTime => prevTime + 1);
@@ -58,8 +66,15 @@ export default function App() {
     return `${mins.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}`;
   };
 
-  const handlePauseResume = () => {
-    setIsPaused(prev => !prev);
+  const handlePauseResume = async () => {
+    // The server runs the game, so pausing has to stop it there, not just the polling
+    try {
+      const response = await fetch(`http://localhost:5000/${isPaused ? 'resume' : 'pause'}`, { method: 'POST' });
+      const data = await response.json();
+      setIsPaused(data.paused);
+    } catch (error) {
+      console.error('Error pausing game:', error);
+    }
   };
 
   const handleReset = async () => {
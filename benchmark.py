@@ -0,0 +1,586 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from metrics import Metrics
+from simulation import GameState, run_headless_game, BEAST_DETECTION_RADIUS
+
+
+def rate(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def bench_headless_games(num_games: int = 2000) -> float:
+    """One GameState at a time; bench_batch_engine has the lockstep engine for comparison."""
+    start = time.perf_counter()
+    for _ in range(num_games):
+        run_headless_game()
+    elapsed = time.perf_counter() - start
+    games_per_second = num_games / elapsed
+    print(f"headless games: {num_games} in {elapsed:.2f}s ({games_per_second:.0f} games/s)")
+    return games_per_second
+
+
+def bench_memory_per_game(num_games: int = 1000, rounds: int = 20) -> float:
+    # Warm up first so lazy imports inside bots are not charged to the games
+    GameState(headless=True, seed=0).run_to_completion()
+    games = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for seed in range(num_games):
+        game = GameState(headless=True, seed=seed)
+        game.run_to_completion(max_rounds=rounds)
+        games.append(game)
+    per_game = (tracemalloc.get_traced_memory()[0] - baseline) / num_games
+    tracemalloc.stop()
+    print(f"memory: {per_game:,.0f} bytes per resident game after {rounds} rounds")
+    return per_game
+
+
+def bench_update_throughput(num_games: int = 300) -> float:
+    entity_turns = 0
+    start = time.perf_counter()
+    for seed in range(num_games):
+        game = GameState(headless=True, seed=seed)
+        game.run_to_completion()
+        entity_turns += game.turn_counter * len(game.entities)
+    turns_per_second = entity_turns / (time.perf_counter() - start)
+    print(f"update throughput: {turns_per_second:,.0f} entity turns/s")
+    return turns_per_second
+
+
+def bench_engineer_turn_scaling(sizes=(10, 40, 160, 320), rounds: int = 5):
+    """Time engineer turns (bot call plus collision and phase checks) as the roster grows."""
+    from engineer_functions import edgy_engineer
+    from simulation import EntityType
+
+    for size in sizes:
+        roster = [(f'Edgy {i}', '🏃', edgy_engineer) for i in range(size)]
+        game = GameState(headless=True, seed=0, roster=roster)
+        elapsed, turns = 0.0, 0
+        while game.turn_counter < rounds and not game.game_over:
+            is_engineer = game.entities[game.current_turn_index].entity_type == EntityType.ENGINEER
+            start = time.perf_counter()
+            game.step()
+            if is_engineer:
+                elapsed += time.perf_counter() - start
+                turns += 1
+        print(f"{size:>4} engineers: {elapsed / turns * 1e6:.1f} us per engineer turn")
+
+
+def bench_broadcast_fanout(spectator_counts=(1, 10, 100, 500), ticks: int = 200):
+    """Publisher CPU per tick (step, to_dict, JSON, fan-out) as the number of spectators grows."""
+    import json
+    import threading
+    from broadcast import Broadcaster
+
+    for count in spectator_counts:
+        broadcaster = Broadcaster()
+        received = [0] * count
+
+        def spectate(slot: int):
+            for message in broadcaster.subscribe(keepalive=1.0):
+                if message is not None:
+                    received[slot] += 1
+
+        threads = [threading.Thread(target=spectate, args=(slot,), daemon=True) for slot in range(count)]
+        for thread in threads:
+            thread.start()
+        while broadcaster.subscribers < count:
+            time.sleep(0.01)
+
+        game = GameState(headless=True, seed=0)
+        game.run_to_completion(max_rounds=1)
+        compute, fan_out = 0.0, 0.0
+        for _ in range(ticks):
+            start = time.thread_time()
+            if not game.step():
+                game = GameState(headless=True, seed=game.seed + 1)
+            payload = json.dumps(game.to_dict()).encode()
+            encoded = time.thread_time()
+            broadcaster.publish(payload)
+            compute += encoded - start
+            fan_out += time.thread_time() - encoded
+            # Leave the spectators time to drain, as a real tick interval would
+            time.sleep(0.002)
+        broadcaster.close()
+        for thread in threads:
+            thread.join()
+        print(f"{count:>4} spectators: {compute / ticks * 1e6:.0f} us step+encode, "
+              f"{fan_out / ticks * 1e6:.0f} us fan-out per tick, "
+              f"{sum(received) / count:.0f}/{ticks} frames per spectator")
+
+
+def midgame_state(bitboard: bool, seed: int = 1, rounds: int = 12) -> GameState:
+    game = GameState(headless=True, seed=seed, bitboard=bitboard)
+    game.run_to_completion(max_rounds=rounds)
+    return game
+
+
+def bench_bitboard(iterations: int = 200000):
+    """Detection with and without the bitboard; collisions, read from the contested cells in both modes, for scale."""
+    list_game = midgame_state(bitboard=False)
+    board_game = midgame_state(bitboard=True)
+    print(f"collision checks (contested cells): {rate(list_game.check_collisions, iterations):,.0f}/s")
+    for label, game in (('list scan', list_game), ('bitboard', board_game)):
+        detection = rate(lambda: game.detect_target(game.beast, BEAST_DETECTION_RADIUS), iterations)
+        print(f"{label:>10}: {detection:,.0f} detections/s")
+
+    board = board_game.bitboard
+    beast_position = board_game.beast.position
+    raw_detection = rate(lambda: board.count_detected(beast_position, BEAST_DETECTION_RADIUS), iterations)
+    print(f"{'raw masks':>10}: {raw_detection:,.0f} detection popcounts/s")
+
+
+def bench_batch_engine(num_games: int = 10000):
+    from batch_engine import run_batch, VECTORIZED_BOTS
+    from simulation import DEFAULT_ROSTER
+
+    vectorized_roster = [entry for entry in DEFAULT_ROSTER if entry[2] in VECTORIZED_BOTS]
+    for label, roster in (('default roster', DEFAULT_ROSTER), ('vectorized bots only', vectorized_roster)):
+        start = time.perf_counter()
+        run_batch(num_games, seed=0, roster=roster)
+        elapsed = time.perf_counter() - start
+        print(f"batch engine, {label}: {num_games} games in {elapsed:.2f}s ({num_games / elapsed:,.0f} games/s)")
+
+
+def bench_tick_scheduler(num_sessions: int = 100, tick_rate: float = 10.0, seconds: float = 3.0):
+    """Tick lag with many server-ticked games, while a reader thread polls snapshots as fast as it can."""
+    import threading
+    from sessions import SessionManager
+    from ticker import TickScheduler
+
+    manager = SessionManager(archive_dir=None, game_factory=lambda **kwargs: GameState(headless=True, **kwargs))
+    scheduler = TickScheduler(manager)
+    games = [manager.create(seed=seed, tick_rate=tick_rate) for seed in range(num_sessions)]
+    reads = 0
+    done = threading.Event()
+
+    def poll():
+        nonlocal reads
+        while not done.is_set():
+            for session in games:
+                session.history.latest_bytes(None, None)
+                reads += 1
+
+    reader = threading.Thread(target=poll, daemon=True)
+    scheduler.start()
+    reader.start()
+    time.sleep(seconds)
+    done.set()
+    scheduler.stop()
+    reader.join()
+    turns = sum(session.game_state.version for session in games)
+    print(f"tick scheduler: {num_sessions} games at {tick_rate:g} tps, {turns / seconds:,.0f} turns/s, "
+          f"max lag {scheduler.max_lag * 1e3:.1f} ms, {scheduler.late_ticks} late ticks, "
+          f"{reads / seconds:,.0f} snapshot reads/s")
+
+
+def bench_results_store(num_games: int = 5000):
+    """Cost of recording one finished game as the results history grows."""
+    import os
+    import tempfile
+    from outputs import ResultsStore
+
+    game = GameState(headless=True, seed=0)
+    game.run_to_completion()
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultsStore(path=os.path.join(directory, 'results.jsonl'), legacy_csv=None)
+        start = time.perf_counter()
+        for _ in range(num_games):
+            store.record(game)
+        recorded = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = store.wide_rows()
+        table = time.perf_counter() - start
+    print(f"results store: {recorded / num_games * 1e6:.1f} us per record, "
+          f"{num_games / written:,.0f} games/s on disk, {table * 1e6:.0f} us recent table ({len(rows)} rows)")
+
+
+def bench_bot_workers(num_games: int = 50):
+    """Games per second with every bot in its own worker process, against in-process calls."""
+    from bot_workers import BotWorkerPool
+    from simulation import ENGINEER_FUNCTIONS
+
+    pool = BotWorkerPool(ENGINEER_FUNCTIONS)
+    try:
+        for label, executor in (('in process', None), ('worker processes', pool)):
+            start = time.perf_counter()
+            for seed in range(num_games):
+                GameState(headless=True, seed=seed, bot_executor=executor).run_to_completion()
+            elapsed = time.perf_counter() - start
+            print(f"bots {label}: {num_games / elapsed:,.0f} games/s")
+        moves = sum(counters['calls'] for counters in pool.stats().values())
+        print(f"worker round trip: {elapsed / moves * 1e6:.0f} us per move, {pool.stats()}")
+    finally:
+        pool.close()
+
+
+def bench_simultaneous_moves(rounds: int = 20, bot_latency: float = 0.002):
+    """Time per round with sequential turns vs the simultaneous engineer phase.
+
+    Runs the default roster with worker processes, then ten bots that each
+    block for `bot_latency` seconds, where the round time should approach
+    one bot's latency rather than the sum.
+    """
+    from bot_workers import BotWorkerPool
+    from engineer_functions import edgy_engineer
+    from simulation import ENGINEER_FUNCTIONS
+
+    def slow_edgy(*args):
+        time.sleep(bot_latency)
+        return edgy_engineer(*args)
+
+    slow_roster = [(f'Slow {i}', '🐢', slow_edgy) for i in range(10)]
+    pool = BotWorkerPool(ENGINEER_FUNCTIONS)
+    try:
+        for label, kwargs in (('default roster, worker processes', {'bot_executor': pool}),
+                              (f'10 bots blocking {bot_latency * 1e3:g} ms', {'roster': slow_roster})):
+            for simultaneous in (False, True):
+                game = GameState(headless=True, seed=0, simultaneous=simultaneous, **kwargs)
+                game.run_to_completion(max_rounds=1)
+                start = time.perf_counter()
+                played = game.turn_counter
+                game.run_to_completion(max_rounds=rounds)
+                per_round = (time.perf_counter() - start) / (game.turn_counter - played)
+                mode = 'simultaneous' if simultaneous else 'sequential'
+                print(f"{label}, {mode}: {per_round * 1e3:.2f} ms per round")
+    finally:
+        pool.close()
+
+
+def bench_threat_field(sizes=((12, 10), (30, 30), (300, 300)), threats: int = 8):
+    """Cost of building the threat distance field, and of repairing it after one threat steps."""
+    from threat_field import ThreatField
+
+    for width, height in sizes:
+        rng = random.Random(0)
+        positions = [(rng.randrange(width), rng.randrange(height)) for _ in range(threats)]
+        build = per_call(lambda: ThreatField(width, height, positions).snapshot(), number=20)
+        field = ThreatField(width, height, positions)
+        field.snapshot()
+
+        def step():
+            x, y = positions[0]
+            new = (x + 1 if x + 1 < width else x - 1, y)
+            field.move(positions[0], new)
+            positions[0] = new
+            field.snapshot()
+
+        repair = per_call(step, number=200)
+        mode = 'numpy' if field.use_numpy else 'bfs'
+        print(f"threat field {width}x{height} ({mode}): {build * 1e6:.0f} us to build, {repair * 1e6:.0f} us per move")
+
+
+def bench_bot_cache(num_games: int = 300):
+    """Headless games with pure bots memoized: fresh seeds, the same seeds again, and after a save and reload."""
+    import tempfile
+    import bot_cache
+
+    def play(memoize: bool) -> float:
+        start = time.perf_counter()
+        for seed in range(num_games):
+            GameState(headless=True, seed=seed, memoize=memoize).run_to_completion()
+        return num_games / (time.perf_counter() - start)
+
+    bot_cache.clear_caches()
+    print(f"bot cache: {play(False):,.0f} games/s without")
+    for label in ('fresh seeds', 'same seeds again'):
+        rate = play(True)
+        hit_rates = ', '.join(f"{name} {stats['hit_rate']:.0%}" for name, stats in bot_cache.cache_stats().items())
+        print(f"bot cache, {label}: {rate:,.0f} games/s; cumulative hit rate {hit_rates}")
+
+    bot_cache.clear_caches()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bot_cache.pickle')
+        play(True)
+        start = time.perf_counter()
+        bot_cache.save_caches(path)
+        saved = time.perf_counter() - start
+        bot_cache.clear_caches()
+        start = time.perf_counter()
+        loaded = bot_cache.load_caches(path)
+        print(f"bot cache: {loaded} moves saved in {saved * 1e3:.0f} ms, loaded in {(time.perf_counter() - start) * 1e3:.0f} ms, "
+              f"then {play(True):,.0f} games/s on the same seeds")
+
+
+# ---- Regression suite ----
+# Every suite benchmark returns {metric: value}; metrics ending in '_per_s' are better higher, all others lower.
+# Timings depend on the machine, so no baseline is committed: until one is saved with --save-baseline
+# on the machine doing the checking, a run only records its results and flags nothing.
+
+SUITE_RESULTS = 'benchmark_results.json'
+SUITE_BASELINE = 'benchmark_baseline.json'
+BOT_CORPUS = 'bench_corpus.json'
+# A metric this much worse than the baseline counts as a regression
+REGRESSION_TOLERANCE = 0.25
+
+
+def per_call(func, number: int, repeat: int = 5) -> float:
+    """Seconds per call, best of `repeat` runs, the least noisy estimate on a shared machine."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def suite_phases(num_games: int = 200) -> Dict[str, float]:
+    """Mean cost of each step() phase over seeded games, from the metrics hooks."""
+    metrics = Metrics()
+    for seed in range(num_games):
+        GameState(headless=True, seed=seed, metrics=metrics).run_to_completion()
+    return {f'phase.{name}_us': phase['mean_us'] for name, phase in metrics.summary()['phases'].items()}
+
+
+def suite_full_games(num_games: int = 500) -> Dict[str, float]:
+    entity_turns = 0
+    start = time.perf_counter()
+    for seed in range(num_games):
+        game = GameState(headless=True, seed=seed)
+        game.run_to_completion()
+        entity_turns += game.turn_counter * len(game.entities)
+    elapsed = time.perf_counter() - start
+    return {'game.games_per_s': num_games / elapsed, 'game.entity_turns_per_s': entity_turns / elapsed}
+
+
+class RecordingExecutor:
+    """A bot_executor that runs bots in process and keeps every view they were shown."""
+
+    def __init__(self):
+        self.views = []
+
+    def move(self, ai_function, args, kwargs):
+        position, threats, engineers, grid_size = args[:4]
+        self.views.append({'position': position, 'threats': threats, 'engineers': engineers,
+                           'grid_size': grid_size, 'turn': args[4] if len(args) > 4 else None})
+        return ai_function(*args, **kwargs)
+
+
+def record_bot_corpus(path: str = BOT_CORPUS, num_games: int = 10, every: int = 7) -> List[Dict]:
+    """Save every `every`-th engineer view from seeded games, so bot costs are measured on fixed inputs."""
+    recorder = RecordingExecutor()
+    for seed in range(num_games):
+        GameState(headless=True, seed=seed, bot_executor=recorder).run_to_completion()
+    views = recorder.views[::every]
+    with open(path, 'w') as f:
+        json.dump(views, f, separators=(',', ':'))
+    return views
+
+
+def load_bot_corpus(path: str = BOT_CORPUS) -> List[Tuple]:
+    if not os.path.exists(path):
+        record_bot_corpus(path)
+    with open(path) as f:
+        views = json.load(f)
+    # JSON turns the tuples bots expect into lists
+    return [(tuple(view['position']), [tuple(p) for p in view['threats']], [tuple(p) for p in view['engineers']],
+             tuple(view['grid_size']), view['turn']) for view in views]
+
+
+def suite_bots(path: str = BOT_CORPUS) -> Dict[str, float]:
+    """Mean cost of one call of each default bot over the recorded corpus."""
+    from bot_registry import bot_arity
+    from game_log import BOT_LOG, NULL_LOG
+    from simulation import DEFAULT_ROSTER, accepts_rng
+
+    corpus = load_bot_corpus(path)
+    results = {}
+    # Time the bots as headless games run them, with their events gated off
+    level = BOT_LOG.level
+    BOT_LOG.set_level(NULL_LOG.level)
+    try:
+        for name, _, ai_function in DEFAULT_ROSTER:
+            calls = [view[:4] + ((view[4] or 0,) if bot_arity(ai_function) > 4 else ()) for view in corpus]
+            uses_rng = accepts_rng(ai_function)
+
+            def replay():
+                kwargs = {'rng': random.Random(0)} if uses_rng else {}
+                for args in calls:
+                    ai_function(*args, **kwargs)
+
+            results[f'bot.{name}_us'] = per_call(replay, number=1) / len(calls) * 1e6
+    finally:
+        BOT_LOG.set_level(level)
+    return results
+
+
+def suite_to_dict(rounds: int = 12, number: int = 2000) -> Dict[str, float]:
+    game = GameState(headless=True, seed=1)
+    game.run_to_completion(max_rounds=rounds)
+    state = game.to_dict()
+    return {
+        'to_dict.build_us': per_call(game.to_dict, number) * 1e6,
+        'to_dict.encode_us': per_call(lambda: json.dumps(state), number) * 1e6,
+        'to_dict.build_and_encode_us': per_call(lambda: json.dumps(game.to_dict()), number) * 1e6,
+    }
+
+
+def suite_results_store(sizes=(10, 1000, 100000), games: int = 200) -> Dict[str, float]:
+    """What save_results_to_csv does per finished game (record plus the recent table), by history size.
+
+    Also times opening a store on that history, which replays the file,
+    and exporting the recent games as a wide CSV.
+    """
+    import tempfile
+    from outputs import ResultsStore
+
+    game = GameState(headless=True, seed=0)
+    game.run_to_completion()
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            store = ResultsStore(path=path, legacy_csv=None)
+            for _ in range(size):
+                store.record(game)
+            store.flush()
+
+            start = time.perf_counter()
+            for _ in range(games):
+                store.record(game)
+                store.wide_rows()
+            results[f'results.{size}.save_us'] = (time.perf_counter() - start) / games * 1e6
+            store.flush()
+
+            start = time.perf_counter()
+            ResultsStore(path=path, legacy_csv=None)
+            results[f'results.{size}.open_ms'] = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            store.export_wide_csv(os.path.join(directory, 'results.csv'))
+            results[f'results.{size}.export_ms'] = (time.perf_counter() - start) * 1e3
+    return results
+
+
+def suite_update_endpoint(requests: int = 2000) -> Dict[str, float]:
+    """/update latency through Flask's test client: a manual game stepped per request, and a ticked game's snapshot."""
+    import importlib.util
+    import statistics
+
+    # A private copy of the app module, with its own Flask app, sessions and scheduler,
+    # so the measurement neither adds games to nor stops the ones a running server uses
+    spec = importlib.util.find_spec('app')
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    client = server.app.test_client()
+    results = {}
+    manual = server.sessions.create(seed=0, headless=True)
+    # Never due, so the scheduler leaves the snapshot alone while it is polled
+    ticked = server.sessions.create(seed=0, tick_rate=1e-9, headless=True)
+    try:
+        for label, session in (('manual', manual), ('ticked', ticked)):
+            url = f'/games/{session.session_id}/update'
+            latencies = []
+            for _ in range(requests):
+                if session.game_state.game_over:
+                    with session.lock:
+                        session.game_state = server.sessions.game_factory(headless=True, seed=session.game_state.seed + 1)
+                start = time.perf_counter()
+                client.get(url)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            results[f'api.update_{label}_p50_us'] = statistics.median(latencies) * 1e6
+            results[f'api.update_{label}_p99_us'] = latencies[int(len(latencies) * 0.99)] * 1e6
+    finally:
+        server.scheduler.stop()
+    return results
+
+
+SUITE = (suite_phases, suite_full_games, suite_bots, suite_to_dict, suite_results_store, suite_update_endpoint)
+
+
+def run_suite(benchmarks=SUITE) -> Dict:
+    metrics = {}
+    for benchmark in benchmarks:
+        start = time.perf_counter()
+        metrics.update(benchmark())
+        print(f"{benchmark.__name__}: {time.perf_counter() - start:.1f}s")
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'metrics': {name: round(value, 3) for name, value in sorted(metrics.items())},
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = REGRESSION_TOLERANCE) -> List[Tuple[str, float, float, float]]:
+    """(metric, baseline, current, relative change) for every metric worse than baseline by more than `tolerance`."""
+    regressions = []
+    for name, value in results['metrics'].items():
+        before = baseline['metrics'].get(name)
+        if not before:
+            continue
+        change = value / before - 1
+        worse = -change if name.endswith('_per_s') else change
+        if worse > tolerance:
+            regressions.append((name, before, value, change))
+    return regressions
+
+
+def print_suite(results: Dict, baseline: Optional[Dict]):
+    for name, value in results['metrics'].items():
+        before = baseline['metrics'].get(name) if baseline else None
+        change = f"{value / before - 1:+7.1%}" if before else ''
+        print(f"  {name:<36} {value:>14,.3f} {change}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and compare it against a stored baseline. '
+                                                 'No baseline ships with the repo: create one on this machine with '
+                                                 '--save-baseline before relying on regression checks.')
+    parser.add_argument('--output', default=SUITE_RESULTS, help='where to write this run as JSON')
+    parser.add_argument('--baseline', default=SUITE_BASELINE, help='machine-specific; not committed')
+    parser.add_argument('--save-baseline', action='store_true', help='make this run the new baseline')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument('--record-corpus', action='store_true', help=f're-record {BOT_CORPUS} first')
+    parser.add_argument('--all', action='store_true', help='also run the exploratory benchmarks, which only print')
+    args = parser.parse_args()
+
+    if args.record_corpus:
+        record_bot_corpus()
+    results = run_suite()
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_suite(results, baseline)
+
+    if args.all:
+        bench_headless_games()
+        bench_memory_per_game()
+        bench_update_throughput()
+        bench_engineer_turn_scaling()
+        bench_broadcast_fanout()
+        bench_bitboard()
+        bench_batch_engine()
+        bench_tick_scheduler()
+        bench_results_store()
+        bench_bot_workers()
+        bench_simultaneous_moves()
+        bench_threat_field()
+        bench_bot_cache()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"saved baseline to {args.baseline}")
+    elif baseline is None:
+        print(f"no baseline at {args.baseline}, so NO regression checks ran; "
+              f"run with --save-baseline on this machine to store one")
+    else:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, value, change in regressions:
+            print(f"REGRESSION {name}: {before:,.3f} -> {value:,.3f} ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}")
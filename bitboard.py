@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+Position = Tuple[int, int]
+
+# Cell (x, y) is bit y * width + x. The default 12x10 grid fits in 120 bits,
+# but Python ints are unbounded so any grid size works.
+
+
+@lru_cache(maxsize=None)
+def detection_masks(width: int, height: int, radius: int) -> Tuple[int, ...]:
+    """For every cell, the mask of cells within Euclidean `radius` of it."""
+    radius_sq = radius * radius
+    masks = []
+    for y in range(height):
+        for x in range(width):
+            mask = 0
+            for oy in range(max(0, y - radius), min(height, y + radius + 1)):
+                for ox in range(max(0, x - radius), min(width, x + radius + 1)):
+                    # sqrt(d) <= r is exactly d <= r*r for integer d and r
+                    if (ox - x) ** 2 + (oy - y) ** 2 <= radius_sq:
+                        mask |= 1 << (oy * width + ox)
+            masks.append(mask)
+    return tuple(masks)
+
+
+class Bitboard:
+    """Occupancy mask of live engineers, for detection checks as bit operations.
+
+    Several engineers can share a cell, so the mask keeps a per-cell count
+    and only clears a bit when the last one leaves. Collisions don't need a
+    mask: GameState tracks contested cells directly.
+    """
+    __slots__ = ('width', 'height', 'engineers', 'engineer_counts')
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.engineers = 0
+        self.engineer_counts: List[int] = [0] * (width * height)
+
+    def index(self, pos: Position) -> int:
+        return pos[1] * self.width + pos[0]
+
+    def bit(self, pos: Position) -> int:
+        return 1 << (pos[1] * self.width + pos[0])
+
+    def contains(self, mask: int, pos: Position) -> bool:
+        return (mask >> (pos[1] * self.width + pos[0])) & 1 == 1
+
+    def add_engineer(self, pos: Position):
+        i = self.index(pos)
+        self.engineer_counts[i] += 1
+        self.engineers |= 1 << i
+
+    def remove_engineer(self, pos: Position):
+        i = self.index(pos)
+        self.engineer_counts[i] -= 1
+        if self.engineer_counts[i] == 0:
+            self.engineers &= ~(1 << i)
+
+    def move_engineer(self, old: Position, new: Position):
+        self.remove_engineer(old)
+        self.add_engineer(new)
+
+    def detected(self, pos: Position, radius: int) -> int:
+        """Mask of cells holding live engineers within `radius` of `pos`."""
+        return self.engineers & detection_masks(self.width, self.height, radius)[self.index(pos)]
+
+    def count_detected(self, pos: Position, radius: int) -> int:
+        # Counts occupied cells; engineers stacked on one cell count once
+        return self.detected(pos, radius).bit_count()
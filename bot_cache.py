@@ -0,0 +1,192 @@
+import hashlib
+import marshal
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from bot_registry import load_target, spec_for
+
+# Distinct states one bot's cache remembers before dropping the least recently used
+DEFAULT_MAXSIZE = 16384
+# Returned by BotCache.get when a state isn't cached; a bot's move may itself be None
+MISSING = object()
+
+
+def state_key(args: Sequence) -> Hashable:
+    """A bot's positional arguments as a hashable key: lists of positions become tuples, order kept."""
+    return tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+
+
+def bot_target(ai_function: Callable) -> str:
+    return f'{ai_function.__module__}:{ai_function.__qualname__}'
+
+
+def code_fingerprint(ai_function: Callable) -> str:
+    """Identifies the bot's code, so moves saved by an older version aren't loaded for a newer one."""
+    return hashlib.sha256(marshal.dumps(ai_function.__code__)).hexdigest()
+
+
+class BotCache:
+    """A bounded LRU of one pure bot's moves, keyed by the arguments it was called with.
+
+    Only for bots whose move depends on their positional arguments alone; the
+    `perception` keyword is derived from those and left out of the key. With
+    `depends_on`, only the arguments at those indices make up the key, so a
+    bot that ignores the other engineers hits whatever they do.
+    Thread-safe, as simultaneous games decide from several threads.
+    """
+
+    def __init__(self, ai_function: Callable, depends_on: Optional[Tuple[int, ...]] = None,
+                 maxsize: int = DEFAULT_MAXSIZE):
+        self.ai_function = ai_function
+        self.depends_on = depends_on
+        self.maxsize = maxsize
+        self.moves: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, args: Tuple) -> Hashable:
+        if self.depends_on is not None:
+            args = [args[index] for index in self.depends_on]
+        return state_key(args)
+
+    def get(self, key: Hashable):
+        """The cached move for `key`, or MISSING."""
+        with self.lock:
+            move = self.moves.get(key, MISSING)
+            if move is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.moves.move_to_end(key)
+        return move
+
+    def put(self, key: Hashable, move):
+        with self.lock:
+            self.moves[key] = move
+            self.moves.move_to_end(key)
+            if len(self.moves) > self.maxsize:
+                self.moves.popitem(last=False)
+
+    def __call__(self, *args, **kwargs):
+        key = self.key(args)
+        move = self.get(key)
+        if move is MISSING:
+            move = self.ai_function(*args, **kwargs)
+            self.put(key, move)
+        return move
+
+    def clear(self):
+        with self.lock:
+            self.moves.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.moves),
+                'hit_rate': round(self.hits / calls, 4) if calls else 0.0,
+            }
+
+
+_caches: Dict[str, BotCache] = {}
+_caches_lock = threading.Lock()
+
+
+def bot_cache(ai_function: Callable) -> BotCache:
+    """The process-wide cache for a bot, shared by every game so states seen in one game pay off in the next."""
+    target = bot_target(ai_function)
+    with _caches_lock:
+        cache = _caches.get(target)
+        if cache is None:
+            spec = spec_for(ai_function)
+            cache = _caches[target] = BotCache(ai_function, spec.depends_on if spec is not None else None)
+        return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    with _caches_lock:
+        caches = dict(_caches)
+    return {cache.ai_function.__name__: cache.stats() for _, cache in sorted(caches.items())}
+
+
+def clear_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def save_caches(path: str):
+    """Write every bot's cached moves to `path`, replacing it atomically."""
+    with _caches_lock:
+        caches = dict(_caches)
+    data = {}
+    for target, cache in caches.items():
+        with cache.lock:
+            moves = list(cache.moves.items())
+        data[target] = (code_fingerprint(cache.ai_function), moves)
+    write_saved(path, data)
+
+
+def read_saved(path: str) -> Dict[str, Tuple[str, list]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def write_saved(path: str, data: Dict[str, Tuple[str, list]]):
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+
+def merge_saved(path: str, parts: Sequence[str], maxsize: int = DEFAULT_MAXSIZE):
+    """Fold files written by save_caches into `path`, leaving this process's caches alone.
+
+    Later parts win, and each bot keeps its `maxsize` most recent moves. A
+    bot's moves saved under a different code fingerprint than the newer
+    part's are dropped rather than mixed.
+    """
+    merged = read_saved(path)
+    for part in parts:
+        for target, (fingerprint, moves) in read_saved(part).items():
+            if target in merged and merged[target][0] == fingerprint:
+                combined = OrderedDict(merged[target][1])
+                for key, move in moves:
+                    combined[key] = move
+                    combined.move_to_end(key)
+                moves = list(combined.items())
+            merged[target] = (fingerprint, moves[-maxsize:])
+    write_saved(path, merged)
+
+
+def load_caches(path: str) -> int:
+    """Warm the caches from a file written by save_caches; returns the number of moves loaded.
+
+    A missing file loads nothing. Moves of a bot that's gone, or whose own
+    code has changed since they were saved, are skipped. Helpers a bot calls
+    aren't fingerprinted, so remove the file after changing one of those.
+    """
+    loaded = 0
+    for target, (fingerprint, moves) in read_saved(path).items():
+        try:
+            ai_function = load_target(target)
+        except (ImportError, AttributeError):
+            continue
+        if code_fingerprint(ai_function) != fingerprint:
+            continue
+        cache = bot_cache(ai_function)
+        for key, move in moves[-cache.maxsize:]:
+            cache.put(key, move)
+        loaded += min(len(moves), cache.maxsize)
+    return loaded
+
@@ -0,0 +1,127 @@
+import functools
+import importlib
+import inspect
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Installed packages add bots by declaring `name = "module:function"` entry points in this group
+ENTRY_POINT_GROUP = 'monster_hunt.bots'
+# Own position, threats, other engineers, grid size; turn-aware bots take the turn number as a fifth
+BASE_ARITY = 4
+PLUGIN_EMOJI = '🤖'
+
+
+@dataclass(frozen=True)
+class BotSpec:
+    """A bot declared by where it lives rather than imported, so only bots in a game are ever loaded.
+
+    `arity` is how many positional arguments the bot takes; None reads it
+    from the signature once loaded. A `pure` bot's move depends on its
+    arguments alone: no rng, no state kept between calls. `depends_on`
+    narrows that to the positional arguments, by index, it actually reads;
+    None means all of them.
+    """
+    name: str
+    emoji: str
+    target: str  # 'module:function'
+    arity: Optional[int] = BASE_ARITY
+    pure: bool = False
+    depends_on: Optional[Tuple[int, ...]] = None
+
+    def load(self) -> Callable:
+        return load_target(self.target)
+
+
+@functools.lru_cache(maxsize=None)
+def load_target(target: str) -> Callable:
+    module_name, _, attribute = target.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+BUILTIN_BOTS = (
+    BotSpec('rapid ryan', '🥺', 'engineer_functions:rapid_ryan', pure=True, depends_on=(0, 1, 3)),
+    BotSpec('Saboteur', '😈', 'engineer_functions:saboteur'),
+    BotSpec('Random Savage', '🦾', 'engineer_functions:randomy_savage'),
+    BotSpec('Mr Sinister', '🦹‍♂️', 'engineer_functions:mr_sinister'),
+    BotSpec('mui_shaggy', '🎃', 'engineer_functions:mui_shaggy', pure=True, depends_on=(0, 1, 3)),
+    BotSpec('Leeroy', '🐔', 'engineer_functions:leeroy', arity=5, pure=True, depends_on=(0, 1, 3, 4)),
+    BotSpec('Leprechaun', '☘️', 'engineer_functions:leprechaun', pure=True, depends_on=(0, 1, 3)),
+    BotSpec('Brave Sir Robin', '🦤', 'engineer_functions:brave_sir_robin', pure=True),
+    BotSpec('Edgy Engineer', '💃', 'engineer_functions:edgy_engineer', pure=True, depends_on=(0, 3)),
+    BotSpec('Aaahhhhh', '😨', 'engineer_functions:aaahhhhh', arity=5),
+)
+DEFAULT_BOT_NAMES = tuple(spec.name for spec in BUILTIN_BOTS)
+
+_registry: Dict[str, BotSpec] = {spec.name: spec for spec in BUILTIN_BOTS}
+_entry_points_read = False
+
+
+def register(spec: BotSpec):
+    _registry[spec.name] = spec
+
+
+def read_entry_points():
+    """Register every installed plugin bot, without importing any of them."""
+    global _entry_points_read
+    # importlib.metadata is slow to import, and only needed when a bot isn't built in
+    from importlib.metadata import entry_points
+
+    if _entry_points_read:
+        return
+    _entry_points_read = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in _registry:
+            register(BotSpec(entry_point.name, PLUGIN_EMOJI, entry_point.value, arity=None))
+
+
+def get_spec(name: str) -> BotSpec:
+    spec = _registry.get(name)
+    if spec is None:
+        read_entry_points()
+        spec = _registry[name]
+    return spec
+
+
+def all_specs() -> List[BotSpec]:
+    read_entry_points()
+    return list(_registry.values())
+
+
+def roster(names: Iterable[str]) -> List[Tuple[str, str, Callable]]:
+    """(name, emoji, ai_function) entries for GameState, loading only the named bots."""
+    return [(spec.name, spec.emoji, spec.load()) for spec in map(get_spec, names)]
+
+
+@functools.lru_cache(maxsize=None)
+def default_roster() -> List[Tuple[str, str, Callable]]:
+    """The built-in bots, loaded on first use. Shared, so don't modify it."""
+    return roster(DEFAULT_BOT_NAMES)
+
+
+def spec_for(ai_function: Callable) -> Optional[BotSpec]:
+    """The registered spec for a bot function, however it was imported; None for unregistered bots."""
+    target = f"{getattr(ai_function, '__module__', None)}:{getattr(ai_function, '__qualname__', None)}"
+    for spec in _registry.values():
+        if spec.target == target:
+            return spec
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def bot_arity(ai_function: Callable) -> int:
+    """Positional arguments the bot takes: its declared arity, else the ones its signature requires."""
+    spec = spec_for(ai_function)
+    if spec is not None and spec.arity is not None:
+        return spec.arity
+    try:
+        parameters = inspect.signature(ai_function).parameters.values()
+    except (TypeError, ValueError):
+        return BASE_ARITY
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    return sum(1 for parameter in parameters
+               if parameter.kind in positional and parameter.default is inspect.Parameter.empty)
+
+
+def is_pure(ai_function: Callable) -> bool:
+    spec = spec_for(ai_function)
+    return spec is not None and spec.pure
@@ -0,0 +1,198 @@
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from game_log import BOT_LOG, WARNING
+
+# Budget for one move, in seconds
+DEFAULT_MOVE_TIMEOUT = 0.05
+# A fresh worker's first move may pay for lazy imports inside the bot
+FIRST_MOVE_TIMEOUT = 2.0
+
+
+def serve_bot(ai_function: Callable, conn):
+    """Worker process loop: answer (call id, args, kwargs, rng seed) requests until the pipe closes."""
+    sys.stdout = open(os.devnull, 'w')
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        call_id, args, kwargs, seed = request
+        if seed is not None:
+            kwargs['rng'] = random.Random(seed)
+        try:
+            reply = (call_id, True, ai_function(*args, **kwargs))
+        except Exception as error:
+            reply = (call_id, False, repr(error))
+        conn.send(reply)
+
+
+class BotWorker:
+    """One child process running a single bot function."""
+
+    def __init__(self, ai_function: Callable, context):
+        self.ai_function = ai_function
+        self.context = context
+        self.call_id = 0
+        self.calls = 0
+        self.start()
+
+    def start(self):
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=serve_bot, args=(self.ai_function, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(0.5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def restart(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.start()
+
+    def call(self, args: Tuple, kwargs: Dict, seed: Optional[int], timeout: float) -> Tuple[str, object]:
+        """Run one move. Returns ('ok', direction), ('error', message), ('timeout', None) or ('crash', None)."""
+        self.call_id += 1
+        self.calls += 1
+        deadline = time.monotonic() + timeout
+        try:
+            self.conn.send((self.call_id, args, kwargs, seed))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    return 'timeout', None
+                call_id, ok, value = self.conn.recv()
+                if call_id == self.call_id:
+                    return ('ok', value) if ok else ('error', value)
+        except (EOFError, BrokenPipeError, OSError):
+            return 'crash', None
+
+
+class BotWorkerPool:
+    """Engineer functions run in pre-forked worker processes with a per-move deadline.
+
+    Pass one as GameState's `bot_executor`. A move that times out, raises
+    or kills its worker counts as staying put (None); a worker that timed
+    out or died is replaced. Workers outlive games, so a pool should be
+    shared rather than created per game. Bots taking an `rng` get a
+    Random seeded from the game's stream, which keeps seeded games
+    reproducible in this mode, though not identical to in-process play.
+    """
+
+    def __init__(self, functions: Iterable[Callable] = (), workers_per_bot: int = 1,
+                 timeout: float = DEFAULT_MOVE_TIMEOUT, context=None):
+        self.workers_per_bot = workers_per_bot
+        self.timeout = timeout
+        self.context = context or multiprocessing.get_context()
+        self.lock = threading.Lock()
+        self.idle: Dict[Callable, queue.Queue] = {}
+        self.workers: List[BotWorker] = []
+        self.counters: Dict[str, Dict[str, int]] = {}
+        for ai_function in functions:
+            self.workers_for(ai_function)
+
+    def workers_for(self, ai_function: Callable) -> queue.Queue:
+        with self.lock:
+            idle = self.idle.get(ai_function)
+            if idle is None:
+                idle = self.idle[ai_function] = queue.Queue()
+                for _ in range(self.workers_per_bot):
+                    worker = BotWorker(ai_function, self.context)
+                    self.workers.append(worker)
+                    idle.put(worker)
+                self.counters[ai_function.__name__] = {'calls': 0, 'timeouts': 0, 'errors': 0, 'restarts': 0}
+            return idle
+
+    def move(self, ai_function: Callable, args: Tuple, kwargs: Dict):
+        """The bot's direction for one move, or None if it failed to answer in time."""
+        seed = None
+        if 'rng' in kwargs:
+            kwargs = dict(kwargs)
+            seed = kwargs.pop('rng').getrandbits(64)
+        idle = self.workers_for(ai_function)
+        name = ai_function.__name__
+        worker = idle.get()
+        try:
+            timeout = self.timeout
+            if worker.calls == 0 and not self.counters[name]['timeouts']:
+                # Grace for lazy imports, until the bot has shown it can hang
+                timeout = max(timeout, FIRST_MOVE_TIMEOUT)
+            status, value = worker.call(args, kwargs, seed, timeout)
+            if status in ('timeout', 'crash'):
+                worker.restart()
+        finally:
+            idle.put(worker)
+
+        with self.lock:
+            counters = self.counters[name]
+            counters['calls'] += 1
+            if status == 'timeout':
+                counters['timeouts'] += 1
+            elif status == 'error':
+                counters['errors'] += 1
+            if status in ('timeout', 'crash'):
+                counters['restarts'] += 1
+        if status != 'ok':
+            if BOT_LOG.warning_on:
+                BOT_LOG.emit(WARNING, f'bot_{status}', bot=name, detail=value)
+            return None
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {name: dict(counters) for name, counters in self.counters.items()}
+
+    def prometheus(self) -> str:
+        """Per-bot move outcome counters in Prometheus text format."""
+        lines = []
+        stats = self.stats()
+        for key in ('calls', 'timeouts', 'errors', 'restarts'):
+            metric = f'monster_hunt_bot_worker_{key}_total'
+            lines.append(f'# TYPE {metric} counter')
+            for name, counters in sorted(stats.items()):
+                lines.append(f'{metric}{{bot="{name}"}} {counters[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        with self.lock:
+            workers, self.workers = self.workers, []
+            self.idle.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool_started() -> bool:
+    return _pool is not None
+
+
+def shared_pool() -> BotWorkerPool:
+    """A process-wide pool pre-forked for the default roster, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from simulation import ENGINEER_FUNCTIONS
+            _pool = BotWorkerPool(ENGINEER_FUNCTIONS)
+        return _pool
@@ -0,0 +1,95 @@
+import threading
+from collections import deque
+from typing import Iterator, Optional, Tuple
+
+
+class Broadcaster:
+    """Fan one stream of pre-encoded frames out to many readers.
+
+    Frames live in a single shared ring of `buffer_size` entries, and every
+    subscriber only keeps a cursor into it. That bounds what a slow
+    subscriber can fall behind by: once its next frame has left the ring it
+    skips straight to the newest one. Publishing never encodes per
+    subscriber; the same bytes object is handed to everybody.
+
+    Publishing costs the same for one subscriber or thousands. Waiting
+    subscribers block on a shared gate, a held lock that the publisher
+    releases once. Each subscriber the gate lets through releases it again
+    for the next, so the wake-ups happen on the subscribers' threads.
+    """
+
+    def __init__(self, buffer_size: int = 8):
+        self.lock = threading.Lock()
+        self.frames = deque(maxlen=buffer_size)  # (sequence, encoded event)
+        self.sequence = 0
+        self.subscribers = 0
+        self.closed = False
+        self.gate = held_lock()
+
+    def open_gate(self):
+        """Let every subscriber waiting on the current gate through. Call with self.lock held."""
+        gate, self.gate = self.gate, held_lock()
+        gate.release()
+
+    def publish(self, data: bytes, event: str = 'state') -> int:
+        """Encode `data` as one Server-Sent Event and wake every subscriber."""
+        with self.lock:
+            self.sequence += 1
+            self.frames.append((self.sequence, sse_event(self.sequence, data, event)))
+            self.open_gate()
+            return self.sequence
+
+    def latest(self) -> Optional[Tuple[int, bytes]]:
+        with self.lock:
+            return self.frames[-1] if self.frames else None
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.open_gate()
+
+    def subscribe(self, keepalive: float = 15.0) -> Iterator[Optional[bytes]]:
+        """Yield frames as they are published, starting from the newest.
+
+        Yields None after `keepalive` seconds without a frame so the caller
+        can write a heartbeat and notice disconnected clients.
+        """
+        with self.lock:
+            self.subscribers += 1
+            cursor = self.frames[-1][0] - 1 if self.frames else self.sequence
+        try:
+            while True:
+                with self.lock:
+                    gate = self.gate if self.sequence == cursor and not self.closed else None
+                if gate is not None and gate.acquire(timeout=keepalive):
+                    # Hand the wake-up on to the next subscriber waiting on this gate
+                    gate.release()
+                with self.lock:
+                    if self.closed:
+                        return
+                    if self.sequence == cursor:
+                        pending = None
+                    elif self.frames[0][0] > cursor + 1:
+                        # Fell behind the ring: drop to the latest frame
+                        pending = [self.frames[-1]]
+                    else:
+                        pending = [frame for frame in self.frames if frame[0] > cursor]
+                if pending is None:
+                    yield None
+                    continue
+                for sequence, message in pending:
+                    cursor = sequence
+                    yield message
+        finally:
+            with self.lock:
+                self.subscribers -= 1
+
+
+def held_lock() -> threading.Lock:
+    lock = threading.Lock()
+    lock.acquire()
+    return lock
+
+
+def sse_event(event_id: int, data: bytes, event: str = 'state') -> bytes:
+    return b'id: %d\nevent: %s\ndata: %s\n\n' % (event_id, event.encode(), data)
@@ -1,53 +1,46 @@
+import math
 import random
 from typing import Tuple, List, Dict, Optional
+from game_log import BOT_LOG, INFO
+from perception import Perception
 
 Position = Tuple[int, int]
 Direction = Optional[str]
 
-def rapid_ryan(self_pos: Position, beast_pos: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int]) -> Direction:
-    MOVE_OPTIONS = {
-        (0, 0): None,
-        (0, -1): "up",
-        (0, 1): "down",
-        (-1, 0): "left",
-        (1, 0): "right"
-    }
-
-    def is_valid_position(pos: Position) -> bool:
-        x, y = pos
-        grid_width, grid_height = grid_size
-        return 0 <= x < grid_width and 0 <= y < grid_height
+# Tried in this order, so ties go to the earlier move
+RAPID_RYAN_MOVES = (None, 'up', 'down', 'left', 'right')
 
-    add_pos = lambda p1, p2: tuple(map(sum, zip(p1, p2)))
-    get_distance = lambda p1, p2: sum(map(lambda x, y: abs(x-y), p1, p2))
 
-    possible_destinations = {add_pos(self_pos, move_option): move_option for move_option in MOVE_OPTIONS if is_valid_position(add_pos(self_pos, move_option))}
-    big_beast_pos, *zombie_pos = beast_pos
+def rapid_ryan(self_pos: Position, beast_pos: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int],
+               perception: Optional[Perception] = None) -> Direction:
+    if perception is None:
+        perception = Perception.from_view(self_pos, beast_pos, other_engineers, grid_size)
+    moves = perception.moves(self_pos)
+    possible_moves = [(option, moves[option]) for option in RAPID_RYAN_MOVES if option in moves]
 
-    possible_destinations_not_on_beasts = [dest for dest in possible_destinations.keys() if not any([dest == b_pos for b_pos in beast_pos])]
+    possible_moves_not_on_beasts = [move for move in possible_moves if move[1] not in perception.threats]
 
-    possible_destinations_not_next_to_zombies = [dest for dest in possible_destinations_not_on_beasts if not any([get_distance(dest, z_pos) <= 1 for z_pos in zombie_pos])]
+    # Step distances to the beast first, then each zombie
+    possible_moves_not_next_to_zombies = [move for move in possible_moves_not_on_beasts if all(distance > 1 for distance in perception.manhattan_distances(move[1])[1:])]
     # all possible dests not on zombies/beast are next to zombies -> hence allow moves next to zombies
-    if not possible_destinations_not_next_to_zombies:
-        possible_destinations_not_next_to_zombies = possible_destinations_not_on_beasts
+    if not possible_moves_not_next_to_zombies:
+        possible_moves_not_next_to_zombies = possible_moves_not_on_beasts
     
     # all possible dests are on zombies/beasts -> give up
-    if not possible_destinations_not_next_to_zombies:
+    if not possible_moves_not_next_to_zombies:
         return None
 
-    furtherest_dest = max(possible_destinations_not_next_to_zombies, key=lambda dest_pos: get_distance(dest_pos, big_beast_pos))
-    return MOVE_OPTIONS[possible_destinations[furtherest_dest]]
-
-def saboteur(self_pos: Position, beast_positions: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int]) -> Direction:
-    import numpy as np
+    furtherest_move = max(possible_moves_not_next_to_zombies, key=lambda move: perception.manhattan_distances(move[1])[0])
+    return furtherest_move[0]
 
+def saboteur(self_pos: Position, beast_positions: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int], rng: random.Random = random) -> Direction:
     beast_vector = [self_pos[0] - sum([pos[0] for pos in beast_positions]), self_pos[1] - sum([pos[1] for pos in beast_positions])] 
-    beast_dist =  np.linalg.norm(beast_vector)
-    beast_vector = beast_vector / beast_dist
+    beast_dist = math.sqrt(beast_vector[0] ** 2 + beast_vector[1] ** 2)
+    beast_vector = unit_vector(beast_vector, beast_dist)
     
     eng_vector = [self_pos[0] - sum([pos[0] for pos in other_engineers]), self_pos[1] - sum([pos[1] for pos in other_engineers])] 
-    eng_dist =  np.linalg.norm(eng_vector)
-    eng_vector = eng_vector / eng_dist
+    eng_dist = math.sqrt(eng_vector[0] ** 2 + eng_vector[1] ** 2)
+    eng_vector = unit_vector(eng_vector, eng_dist)
 
     threshold = 4
     
@@ -61,10 +54,10 @@ def saboteur(self_pos: Position, beast_positions: List[Position], other_engineer
             vector[1] = 0  
     elif (beast_dist <= threshold) & (len(other_engineers) != 0): # If the beast is close and there are others around
         ### Run towards the other engineers ###
-        vector = eng_vector * -1
+        vector = [-component for component in eng_vector]
     elif beast_dist > threshold: # If outside of the range of the beast
         ### Run towards the beast ###
-        vector = beast_vector * -1
+        vector = [-component for component in beast_vector]
     
     if abs(vector[0]) > abs(vector[1]): # Move L/R
         if vector[0] < 0:
@@ -78,40 +71,44 @@ def saboteur(self_pos: Position, beast_positions: List[Position], other_engineer
             direction = 'down'
     elif abs(vector[0]) == abs(vector[1]): # Pick randomly
         if (vector[0] > 0) & (vector[1] > 0):
-            direction = random.choice(['right', 'down'])
+            direction = rng.choice(['right', 'down'])
         elif (vector[0] > 0) & (vector[1] < 0):
-            direction = random.choice([ 'right', 'up'])
+            direction = rng.choice([ 'right', 'up'])
         elif (vector[0] < 0) & (vector[1] > 0):
-            direction = random.choice(['left', 'down'])
+            direction = rng.choice(['left', 'down'])
         elif (vector[0] < 0) & (vector[1] < 0):
-            direction = random.choice(['left', 'up'])
+            direction = rng.choice(['left', 'up'])
       
     return direction
 
 
-def randomy_savage(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int]) -> Direction:
-    direction = random.choice(['up', 'down', 'left', 'right'])
+def unit_vector(vector: List[int], length: float) -> List[float]:
+    # A zero vector has no direction: NaN components, which fail every comparison, so saboteur stays put
+    if length == 0:
+        return [math.nan, math.nan]
+    return [vector[0] / length, vector[1] / length]
+
+
+def randomy_savage(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int], rng: random.Random = random) -> Direction:
+    direction = rng.choice(['up', 'down', 'left', 'right'])
     return direction
 
-def mr_sinister(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int]) -> Direction | None:
+# Tried in this order, so ties go to the earlier move
+SINISTER_MOVES = ('up', 'right', 'down', 'left', None)
+
+
+def mr_sinister(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int], rng: random.Random = random,
+                perception: Optional[Perception] = None) -> Direction | None:
     BEAST_DETECTION_RANGE = 5
     SAFE_DISTANCE = 5
 
     def distance(pos1: Position, pos2: Position) -> float:
         return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
 
-    def is_valid_move(pos: Position) -> bool:
-        return 0 <= pos[0] < grid_size[0] and 0 <= pos[1] < grid_size[1]
-
-    moves = [
-        ('up', (self_pos[0], self_pos[1] - 1)),
-        ('right', (self_pos[0] + 1, self_pos[1])),
-        ('down', (self_pos[0], self_pos[1] + 1)),
-        ('left', (self_pos[0] - 1, self_pos[1])),
-        (None, self_pos)  # Option to stay in place
-    ]
-
-    valid_moves = [(direction, pos) for direction, pos in moves if is_valid_move(pos)]
+    if perception is None:
+        perception = Perception.from_view(self_pos, beast_pos, other_engineers, grid_size)
+    moves = perception.moves(self_pos)
+    valid_moves = [(direction, moves[direction]) for direction in SINISTER_MOVES if direction in moves]
 
     if not valid_moves:
         return None  # This should never happen as staying in place is always valid
@@ -119,12 +116,14 @@ def mr_sinister(self_pos: Position, beast_pos: List[Position], other_engineers:
     if len(beast_pos) == 0:
         return 'down'  # Default movement when no beast is present
 
-    closest_beast = min(beast_pos, key=lambda beast: distance(self_pos, beast))
-    distance_to_beast = distance(self_pos, closest_beast)
+    closest = perception.nearest_threat_index(self_pos)
+
+    def distance_to_beast(pos: Position) -> float:
+        return perception.squared_distances(pos)[closest] ** 0.5
 
     # Phase 1: Move within detection range of the beast
-    if distance_to_beast > BEAST_DETECTION_RANGE:
-        best_move = min(valid_moves, key=lambda move: abs(distance(move[1], closest_beast) - BEAST_DETECTION_RANGE))
+    if distance_to_beast(self_pos) > BEAST_DETECTION_RANGE:
+        best_move = min(valid_moves, key=lambda move: abs(distance_to_beast(move[1]) - BEAST_DETECTION_RANGE))
         return best_move[0]
 
     # Phase 2: Move towards another engineer while maintaining safe distance from beast
@@ -133,28 +132,33 @@ def mr_sinister(self_pos: Position, beast_pos: List[Position], other_engineers:
         
         def score_move(move):
             dist_to_engineer = distance(move[1], nearest_engineer)
-            dist_to_beast = distance(move[1], closest_beast)
+            dist_to_beast = distance_to_beast(move[1])
             safety_score = abs(dist_to_beast - SAFE_DISTANCE)
             return dist_to_engineer + safety_score * 2  # Prioritize safety
 
         best_move = min(valid_moves, key=lambda move: score_move(move))
         
-        if distance(best_move[1], closest_beast) >= SAFE_DISTANCE:
+        if distance_to_beast(best_move[1]) >= SAFE_DISTANCE:
             return best_move[0]
     
     # If no suitable move is found, try to maintain safe distance from beast
-    safe_moves = [move for move in valid_moves if distance(move[1], closest_beast) >= SAFE_DISTANCE]
+    safe_moves = [move for move in valid_moves if distance_to_beast(move[1]) >= SAFE_DISTANCE]
     if safe_moves:
-        return random.choice(safe_moves)[0]
+        return rng.choice(safe_moves)[0]
     
     # If no safe move is available, choose the move that maximizes distance from beast
-    return max(valid_moves, key=lambda move: distance(move[1], closest_beast))[0]
+    return max(valid_moves, key=lambda move: distance_to_beast(move[1]))[0]
     
 
-def mui_shaggy(self_pos: Position, beast_pos: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int]) -> Direction:
+def mui_shaggy(self_pos: Position, beast_pos: List[Position], other_engineers: List[Position], grid_size: Tuple[int, int],
+               perception: Optional[Perception] = None) -> Direction:
 
-  def distance(pos1, pos2):
-    return ((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)**0.5
+  if perception is None:
+    perception = Perception.from_view(self_pos, beast_pos, other_engineers, grid_size)
+
+  def distances(pos):
+    # Straight-line distance to the beast, then to each zombie
+    return [squared**0.5 for squared in perception.squared_distances(pos)]
 
   left_pos = (self_pos[0] - 1, self_pos[1])
   right_pos = (self_pos[0] + 1, self_pos[1])
@@ -162,44 +166,39 @@ def mui_shaggy(self_pos: Position, beast_pos: List[Position], other_engineers: L
   down_pos = (self_pos[0], self_pos[1] + 1)
 
   left_space = self_pos[0]
-  right_space = 9 - self_pos[0]
+  right_space = grid_size[0] - 1 - self_pos[0]
   up_space = self_pos[1]
-  down_space = 9 - self_pos[1]
+  down_space = grid_size[1] - 1 - self_pos[1]
 
-  left_zombie = 9
-  right_zombie = 9
-  up_zombie = 9
-  down_zombie = 9
-  
-  for z in range(len(beast_pos)):
-    if z > 0:
-      zombie_pos = beast_pos[z]
-      left_zombie = min(left_zombie,distance(left_pos,zombie_pos))
-      right_zombie = min(right_zombie,distance(right_pos,zombie_pos))
-      up_zombie = min(up_zombie,distance(up_pos,zombie_pos))
-      down_zombie = min(down_zombie,distance(down_pos,zombie_pos))
+  left_beast, *left_zombies = distances(left_pos)
+  right_beast, *right_zombies = distances(right_pos)
+  up_beast, *up_zombies = distances(up_pos)
+  down_beast, *down_zombies = distances(down_pos)
 
-  beast_location = beast_pos[0]
+  left_zombie = min([9] + left_zombies)
+  right_zombie = min([9] + right_zombies)
+  up_zombie = min([9] + up_zombies)
+  down_zombie = min([9] + down_zombies)
 
   if left_space == 0 or left_zombie <= 1:
     left_len = 0
   else:
-    left_len = distance(left_pos,beast_location)
+    left_len = left_beast
 
   if right_space == 0 or right_zombie <= 1:
     right_len = 0
   else:
-    right_len = distance(right_pos,beast_location)
+    right_len = right_beast
 
   if up_space == 0 or up_zombie <=1:
     up_len = 0
   else:
-    up_len = distance(up_pos,beast_location)
+    up_len = up_beast
 
   if down_space == 0 or down_zombie <=1:
     down_len = 0
   else:
-    down_len = distance(down_pos,beast_location)
+    down_len = down_beast
 
   if left_len > right_len:
     x_len = left_len
@@ -243,7 +242,8 @@ def mui_shaggy(self_pos: Position, beast_pos: List[Position], other_engineers: L
       y_space = down_space
 
   if x_len <= 1 and y_len <= 1:
-    print("Zoinks! I should have learned, like, Instant Transmission instead, man!")
+    if BOT_LOG.info_on:
+      BOT_LOG.emit(INFO, 'cornered', bot='mui_shaggy', quote="Zoinks! I should have learned, like, Instant Transmission instead, man!")
     return x_dir
 
   elif x_len > y_len:
@@ -259,37 +259,30 @@ def mui_shaggy(self_pos: Position, beast_pos: List[Position], other_engineers: L
       return y_dir
 
 
-def leeroy(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int], turn_index: int) -> Direction | None:
+def leeroy(self_pos: Position, beast_pos: List[Position], other_engineers: List[Dict], grid_size: Tuple[int, int], turn_index: int,
+           perception: Optional[Perception] = None) -> Direction | None:
     if len(beast_pos) == 0:
         return 'right'
-    
-    def distance(pos1: Position, pos2: Position) -> float:
-        return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
 
-    def is_valid_move(pos: Position) -> bool:
-        return 0 <= pos[0] < grid_size[0] and 0 <= pos[1] < grid_size[1]
-
-    moves = [
-        ('up', (self_pos[0], self_pos[1] - 1)),
-        ('right', (self_pos[0] + 1, self_pos[1])),
-        ('down', (self_pos[0], self_pos[1] + 1)),
-        ('left', (self_pos[0] - 1, self_pos[1])),
-        (None, self_pos)  # Option to stay in place
-    ]
-
-    valid_moves = [(direction, pos) for direction, pos in moves if is_valid_move(pos)]
+    if perception is None:
+        perception = Perception.from_view(self_pos, beast_pos, other_engineers, grid_size, turn_index)
+    moves = perception.moves(self_pos)
+    valid_moves = [(direction, moves[direction]) for direction in SINISTER_MOVES if direction in moves]
 
     if not valid_moves:
         return None  # This should never happen as staying in place is always valid
 
     # Find the beast closest to Alice
-    closest_beast = min(beast_pos, key=lambda beast: distance(self_pos, beast))
+    closest = perception.nearest_threat_index(self_pos)
+
+    def distance_to_beast(pos: Position) -> float:
+        return perception.squared_distances(pos)[closest] ** 0.5
 
     # Run towards the beast crazily if turns > 10
     if turn_index < 10:
-        best_move = max(valid_moves, key=lambda move: distance(move[1], closest_beast))
+        best_move = max(valid_moves, key=lambda move: distance_to_beast(move[1]))
     else:
-        best_move = min(valid_moves, key=lambda move: distance(move[1], closest_beast))
+        best_move = min(valid_moves, key=lambda move: distance_to_beast(move[1]))
       
 
     return best_move[0]
@@ -389,7 +382,7 @@ def leprechaun(self_pos: Position, beast_pos: List[Position], other_engineers: L
         else:
             return "left"
         
-def brave_sir_robin(self_pos, beast_positions, other_engineers, grid_size):
+def brave_sir_robin(self_pos, beast_positions, other_engineers, grid_size, perception=None):
     import math
     """""
     Brave Sir Robin ran away.
@@ -408,47 +401,38 @@ def brave_sir_robin(self_pos, beast_positions, other_engineers, grid_size):
         """""Returns the distance between two positions."""""
         return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
 
-    def valid_move(new_pos):
-        """Checks if the new position is within the grid boundaries."""
-        return 0 <= new_pos[0] < grid_size[0] and 0 <= new_pos[1] < grid_size[1]
+    if perception is None:
+        perception = Perception.from_view(self_pos, beast_positions, other_engineers, grid_size)
+    valid_moves = perception.moves(self_pos)
 
-    def total_distance_from_beasts(pos, beasts):
+    def total_distance_from_beasts(pos):
         """"Calculates the sum of distances to all beasts from a given position."""
-        return sum(distance(pos, beast) for beast in beasts)
+        return sum(math.sqrt(squared) for squared in perception.squared_distances(pos))
 
     def nearest_entity(pos, entities):
         """"Finds the nearest entity (either beast or engineer) to a given position."""
         return min(entities, key=lambda entity_pos: distance(pos, entity_pos))
 
-    # Define possible moves and their corresponding coordinate changes
-    moves = {
-        "up": (0, -1),
-        "down": (0, 1),
-        "left": (-1, 0),
-        "right": (1, 0)
-    }
+    # Possible moves, tried in this order
+    moves = ("up", "down", "left", "right")
 
     # If there are no other engineers, we are the last one alive
     if not other_engineers:
         # Focus purely on maximizing the distance from all beasts
         max_total_distance_from_beasts = -1
         best_move = None
-        for direction, (dx, dy) in moves.items():
-            new_pos = (self_pos[0] + dx, self_pos[1] + dy)
-            if valid_move(new_pos):
-                new_total_distance_from_beasts = total_distance_from_beasts(new_pos, beast_positions)
+        for direction in moves:
+            if direction in valid_moves:
+                new_total_distance_from_beasts = total_distance_from_beasts(valid_moves[direction])
                 if new_total_distance_from_beasts > max_total_distance_from_beasts:
                     max_total_distance_from_beasts = new_total_distance_from_beasts
                     best_move = direction
         return best_move if best_move else None
 
-    # Normal behavior when there are other engineers around
-    closest_beast = nearest_entity(self_pos, beast_positions)
-    my_distance_to_closest_beast = distance(self_pos, closest_beast)
-
-    # Determine if any engineer is closer to any beast than I am
+    # Determine if any engineer is closer to any beast than I am; squared distances compare the same way
+    my_distances = perception.squared_distances(self_pos)
     engineers_closer_to_any_beast = [
-        eng for eng in other_engineers if any(distance(eng, beast) < distance(self_pos, beast) for beast in beast_positions)
+        eng for eng in other_engineers if any(theirs < mine for theirs, mine in zip(perception.squared_distances(eng), my_distances))
     ]
 
     # Find the closest engineer to me
@@ -459,12 +443,12 @@ def brave_sir_robin(self_pos, beast_positions, other_engineers, grid_size):
     best_move = None
 
     # Iterate through all possible moves to evaluate the best direction
-    for direction, (dx, dy) in moves.items():
-        new_pos = (self_pos[0] + dx, self_pos[1] + dy)
+    for direction in moves:
+        new_pos = valid_moves.get(direction)
 
-        if valid_move(new_pos):
+        if new_pos is not None:
             # Calculate the total distance from all beasts at the new position
-            new_total_distance_from_beasts = total_distance_from_beasts(new_pos, beast_positions)
+            new_total_distance_from_beasts = total_distance_from_beasts(new_pos)
 
             # Calculate the new distance to the closest engineer if I move
             new_distance_to_engineer = distance(new_pos, closest_engineer) if closest_engineer else float('inf')
@@ -504,7 +488,7 @@ def edgy_engineer(self_pos: Position, beast_pos: List[Position], other_engineers
     # If on the left border, but not at the bottom border, go down
     elif curr_x == 0 and curr_y != max_y: return "down"
 
-def aaahhhhh(self_pos, beast_positions, other_engineers, grid_size, time):
+def aaahhhhh(self_pos, beast_positions, other_engineers, grid_size, time, rng=random):
 
     # Helper function to check if a move is valid
     def is_valid_move(pos: Position, grid_size: Tuple[int, int]) -> bool:
@@ -536,14 +520,14 @@ def aaahhhhh(self_pos, beast_positions, other_engineers, grid_size, time):
         elif engineers_left < engineers_right:
             direction = 'left'
         else:
-            direction = random.choice(['left', 'right'])
+            direction = rng.choice(['left', 'right'])
     else:  # On odd turns, choose between up and down
         if engineers_above > engineers_below:
             direction = 'down'
         elif engineers_above < engineers_below:
             direction = 'up'
         else:
-            direction = random.choice(['up', 'down'])
+            direction = rng.choice(['up', 'down'])
 
     # Get the new position based on the chosen direction
     new_pos = directions[direction]
@@ -0,0 +1,99 @@
+import dataclasses
+import functools
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+Position = Tuple[int, int]
+
+# Beast moves in its schedule: a random step, or one from beast_ai
+BEAST_WANDER = 'wander'
+BEAST_HUNT = 'hunt'
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """One rule set. Immutable and hashable, so tables derived from it are cached per config.
+
+    Games with different configs can run side by side in one process; the
+    module constants in simulation.py are DEFAULT_CONFIG's values.
+    """
+    grid_width: int = 12
+    grid_height: int = 10
+    beast_detection_radius: int = 5
+    zombie_detection_radius: int = 5
+    beast_appears: int = 4
+    # Turn the beast starts moving, then turns its move frequency changes from every 2nd to every 3rd to every turn
+    beast_movement: Tuple[int, int, int] = (6, 8, 10)
+    end_game_turns: int = 50
+    beast_beast_mode: bool = True
+    # Besides its regular moves, the beast's turn follows a cycle of `beast_cycle` rounds: the regular move
+    # is a random wander on step `beast_wander_step`, it hunts again on `beast_hunt_step`, and in beast
+    # mode once more on `beast_mode_step`
+    beast_cycle: int = 5
+    beast_wander_step: int = 3
+    beast_hunt_step: int = 0
+    beast_mode_step: int = 2
+
+    def __post_init__(self):
+        # Accept a list, as the old BEAST_MOVEMENT constant was one, but keep the config hashable
+        object.__setattr__(self, 'beast_movement', tuple(self.beast_movement))
+
+    @property
+    def grid_size(self) -> Tuple[int, int]:
+        return (self.grid_width, self.grid_height)
+
+    def replace(self, **changes) -> 'GameConfig':
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self) -> Dict:
+        return dataclasses.asdict(self)
+
+    @property
+    def config_hash(self) -> str:
+        """Stable across processes and runs, unlike hash(), so it can key on-disk caches."""
+        return config_hash(self)
+
+
+@functools.lru_cache(maxsize=None)
+def config_hash(config: GameConfig) -> str:
+    encoded = json.dumps(config.to_dict(), sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def beast_moves_at(config: GameConfig, turn: int) -> Tuple[str, ...]:
+    """The moves the beast makes on its turn in round `turn`, in order."""
+    first, every_third, every_turn = config.beast_movement
+    if turn < first:
+        return ()
+    moves = []
+    frequency = 2 if turn < every_third else 3 if turn < every_turn else 1
+    step = turn % config.beast_cycle
+    if turn % frequency == 0:
+        moves.append(BEAST_WANDER if step == config.beast_wander_step else BEAST_HUNT)
+    if step == config.beast_hunt_step:
+        moves.append(BEAST_HUNT)
+    if config.beast_beast_mode and step == config.beast_mode_step:
+        moves.append(BEAST_HUNT)
+    return tuple(moves)
+
+
+@functools.lru_cache(maxsize=None)
+def beast_schedule(config: GameConfig) -> Tuple[Tuple[str, ...], ...]:
+    """beast_moves_at for every round of a game, indexed by turn."""
+    return tuple(beast_moves_at(config, turn) for turn in range(config.end_game_turns + 1))
+
+
+@functools.lru_cache(maxsize=None)
+def neighbor_cells(width: int, height: int) -> Dict[Position, Tuple[Position, ...]]:
+    """For every cell, the in-bounds cells one step up, down, left or right of it."""
+    neighbors = {}
+    for y in range(height):
+        for x in range(width):
+            steps = ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+            neighbors[(x, y)] = tuple((nx, ny) for nx, ny in steps if 0 <= nx < width and 0 <= ny < height)
+    return neighbors
+
+
+DEFAULT_CONFIG = GameConfig()
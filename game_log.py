@@ -0,0 +1,93 @@
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING'}
+
+# (time, level, event, fields); fields are kept as passed and only formatted by sinks that print
+Record = Tuple[float, int, str, Dict]
+
+
+def format_record(record: Record) -> str:
+    _, level, event, fields = record
+    details = ' '.join(f'{key}={value!r}' for key, value in fields.items())
+    return f'{LEVEL_NAMES.get(level, level)} {event} {details}'.rstrip()
+
+
+class StreamSink:
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def __call__(self, record: Record):
+        print(format_record(record), file=self.stream or sys.stdout)
+
+
+class RingBufferSink:
+    """Keeps the last `capacity` records of a game for post-mortem debugging."""
+
+    def __init__(self, capacity: int = 1000):
+        self.records = deque(maxlen=capacity)
+
+    def __call__(self, record: Record):
+        self.records.append(record)
+
+    def dump(self) -> List[str]:
+        return [format_record(record) for record in self.records]
+
+
+class EventLogger:
+    """Level-gated structured events.
+
+    Call sites on hot paths test the plain boolean gates before emitting:
+
+        if log.debug_on:
+            log.emit(DEBUG, 'chase', target=name, position=position)
+
+    so a disabled level costs one attribute read, with no formatting, repr or
+    argument packing. Fields are handed to the sinks as-is, and a ring buffer
+    keeps them, so pass immutable values rather than live game objects.
+    """
+
+    def __init__(self, level: int = INFO, sinks: Optional[List[Callable[[Record], None]]] = None):
+        self.sinks = list(sinks) if sinks is not None else [StreamSink()]
+        self.set_level(level)
+
+    def set_level(self, level: int):
+        self.level = level
+        self.debug_on = level <= DEBUG
+        self.info_on = level <= INFO
+        self.warning_on = level <= WARNING
+
+    def emit(self, level: int, event: str, **fields):
+        record = (time.time(), level, event, fields)
+        for sink in self.sinks:
+            sink(record)
+
+    def debug(self, event: str, **fields):
+        if self.debug_on:
+            self.emit(DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        if self.info_on:
+            self.emit(INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        if self.warning_on:
+            self.emit(WARNING, event, **fields)
+
+    @classmethod
+    def ring(cls, capacity: int = 1000, level: int = DEBUG) -> 'EventLogger':
+        """A logger that only records into a ring buffer, reachable as `logger.sinks[0]`."""
+        return cls(level, [RingBufferSink(capacity)])
+
+
+# Shared defaults: interactive games log to stdout, headless games log nothing
+CONSOLE_LOG = EventLogger(INFO)
+NULL_LOG = EventLogger(OFF, [])
+# Bots don't see their game's logger; their events go here, off unless someone turns it on
+BOT_LOG = EventLogger(WARNING)
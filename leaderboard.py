@@ -0,0 +1,113 @@
+import argparse
+import threading
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+from outputs import RESULTS_FILE, ResultsStore, iter_games, results_store
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+
+def placements(game: Dict) -> Dict[str, Tuple[int, int]]:
+    """Sort key per engineer: final score, then how long it stayed human. Equal keys are draws."""
+    zombie_order = game.get('zombie_order') or []
+    survived = len(zombie_order)
+    turned = {name: rank for rank, name in enumerate(zombie_order)}
+    return {name: (score, turned.get(name, survived)) for name, score in game['scores'].items()}
+
+
+class Leaderboard:
+    """Multiplayer Elo over finished games.
+
+    Each game is scored as one match per engineer against the rest of the
+    field: the actual result is the share of opponents it placed above (a
+    tie counts half) and the expected result comes from its rating against
+    the mean opponent rating. That keeps an update to a sort and two passes
+    over the players instead of every pairing.
+    """
+
+    def __init__(self, k: float = K_FACTOR, initial: float = INITIAL_RATING):
+        self.k = k
+        self.initial = initial
+        self.lock = threading.Lock()
+        self.ratings: Dict[str, float] = {}
+        self.games: Dict[str, int] = {}
+        self.game_count = 0
+
+    def update(self, game: Dict):
+        keys = placements(game)
+        if len(keys) < 2:
+            return
+        with self.lock:
+            names = sorted(keys, key=keys.get)
+            ratings = {name: self.ratings.get(name, self.initial) for name in names}
+            total = sum(ratings.values())
+            opponents = len(names) - 1
+            below = 0
+            for _, tied in groupby(names, key=keys.get):
+                tied = list(tied)
+                actual = (below + (len(tied) - 1) / 2) / opponents
+                for name in tied:
+                    rating = ratings[name]
+                    expected = 1 / (1 + 10 ** (((total - rating) / opponents - rating) / 400))
+                    self.ratings[name] = rating + self.k * (actual - expected)
+                    self.games[name] = self.games.get(name, 0) + 1
+                below += len(tied)
+            self.game_count += 1
+
+    def standings(self) -> List[Dict]:
+        with self.lock:
+            return [
+                {'rank': rank, 'name': name, 'rating': round(rating, 1), 'games': self.games[name]}
+                for rank, (name, rating) in enumerate(
+                    sorted(self.ratings.items(), key=lambda item: -item[1]), start=1)
+            ]
+
+    @classmethod
+    def rebuild(cls, path: str = RESULTS_FILE, **kwargs) -> 'Leaderboard':
+        """Replay a results file one game at a time."""
+        board = cls(**kwargs)
+        for game in iter_games(path):
+            board.update(game)
+        return board
+
+    def follow(self, store: ResultsStore):
+        """Keep updating from every game the store records from now on."""
+        store.listeners.append(self.update)
+
+
+_leaderboard: Optional[Leaderboard] = None
+_leaderboard_lock = threading.Lock()
+
+
+def leaderboard() -> Leaderboard:
+    """Ratings for the process-wide results store, rebuilt from its history on first use."""
+    global _leaderboard
+    with _leaderboard_lock:
+        if _leaderboard is None:
+            store = results_store()
+            # Holding the store lock means no game can land between the replay and following
+            with store.lock:
+                store.flush()
+                try:
+                    board = Leaderboard.rebuild(store.path)
+                except FileNotFoundError:
+                    board = Leaderboard()
+                board.follow(store)
+            _leaderboard = board
+        return _leaderboard
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bot ratings from recorded game results.')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    rebuild = subcommands.add_parser('rebuild', help='replay a results file and print the standings')
+    rebuild.add_argument('path', nargs='?', default=RESULTS_FILE)
+    rebuild.add_argument('--k', type=float, default=K_FACTOR)
+    args = parser.parse_args()
+
+    board = Leaderboard.rebuild(args.path, k=args.k)
+    print(f'{board.game_count} games')
+    for row in board.standings():
+        print(f"{row['rank']:>3}. {row['name']:<20} {row['rating']:>7.1f} ({row['games']} games)")
@@ -0,0 +1,119 @@
+import bisect
+import threading
+from typing import Dict, List
+
+# Upper bounds in seconds, 1us to 1s in 1-2.5-5 steps
+LATENCY_BUCKETS = tuple(round(m * 10.0 ** e, 9) for e in range(-6, 0) for m in (1, 2.5, 5)) + (1.0,)
+
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'Histogram'):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation; the max if that is the +Inf bucket."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_us': round(self.total / self.count * 1e6, 2) if self.count else 0.0,
+            'p50_us': round(self.quantile(0.5) * 1e6, 2),
+            'p99_us': round(self.quantile(0.99) * 1e6, 2),
+            'max_us': round(self.max * 1e6, 2),
+        }
+
+
+class Metrics:
+    """Latency histograms per bot (one AI call) and per game phase.
+
+    A GameState given a Metrics times every AI call, each entity turn,
+    check_collisions, to_dict and end_game into it; with none, the hooks are
+    a single `is None` test. One Metrics may be shared by many games.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bots: Dict[str, Histogram] = {}
+        self.phases: Dict[str, Histogram] = {}
+
+    def observe_bot(self, name: str, seconds: float):
+        with self.lock:
+            histogram = self.bots.get(name)
+            if histogram is None:
+                histogram = self.bots[name] = Histogram()
+            histogram.observe(seconds)
+
+    def observe_phase(self, phase: str, seconds: float):
+        with self.lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram()
+            histogram.observe(seconds)
+
+    def merge(self, other: 'Metrics'):
+        with other.lock:
+            groups = [(dict(other.bots), self.bots), (dict(other.phases), self.phases)]
+        with self.lock:
+            for source, target in groups:
+                for name, histogram in source.items():
+                    target.setdefault(name, Histogram()).merge(histogram)
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return {
+                'bots': {name: histogram.summary() for name, histogram in sorted(self.bots.items())},
+                'phases': {name: histogram.summary() for name, histogram in sorted(self.phases.items())},
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self.lock:
+            for metric, label, histograms, description in (
+                ('monster_hunt_bot_seconds', 'bot', self.bots, 'Time spent in one AI call.'),
+                ('monster_hunt_phase_seconds', 'phase', self.phases, 'Time spent in one game phase.'),
+            ):
+                lines.append(f'# HELP {metric} {description}')
+                lines.append(f'# TYPE {metric} histogram')
+                for name, histogram in sorted(histograms.items()):
+                    value = escape_label(name)
+                    cumulative = 0
+                    for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{{label}="{value}"}} {histogram.total}')
+                    lines.append(f'{metric}_count{{{label}="{value}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Shared by the games app.py hosts
+SERVER_METRICS = Metrics()
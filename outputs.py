@@ -1,42 +1,199 @@
+import atexit
 import csv
+import json
 import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
 
-def save_results_to_csv(self):
-    results = {eng.name: eng.score for eng in self.engineers}
-    
-    filename = 'results.csv'
-    
-    if not os.path.exists(filename):
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Name'] + ['Game 1'])
-            for name, score in results.items():
-                writer.writerow([name, score])
-    else:
-        with open(filename, 'r') as f:
-            reader = csv.reader(f)
-            headers = next(reader)
-            game_number = len(headers) - 1
-            new_game_column = f'Game {game_number + 1}'
-
-        with open(filename, 'r') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-        for row in rows:
-            name = row['Name']
-            if name in results:
-                row[new_game_column] = results[name]
-
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers + [new_game_column])
+RESULTS_FILE = 'results.jsonl'
+LEGACY_RESULTS_CSV = 'results.csv'
+# How many games the wide results table shown at game end covers
+RECENT_GAMES = 10
+
+
+class ResultsStore:
+    """Append-only game results, one JSON line per engineer per game.
+
+    Recording a game only updates in-memory aggregates and queues its lines;
+    a background thread appends them to `path` in batches, so end_game never
+    waits on disk. Per-bot totals and the recent-games table are read from
+    the aggregates, never by re-reading the file.
+
+    A store opened on a missing file imports the old wide-format results.csv
+    if one exists, numbering its games from 1.
+    """
+
+    def __init__(self, path: str = RESULTS_FILE, legacy_csv: Optional[str] = LEGACY_RESULTS_CSV,
+                 batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.game_count = 0
+        self.stats: Dict[str, Dict[str, int]] = {}  # name -> games, total, zombified
+        self.recent = deque(maxlen=RECENT_GAMES)  # (game number, {name: score})
+        # Called with every recorded game, after the aggregates are updated; must not call back into the store
+        self.listeners: List[Callable[[Dict], None]] = []
+
+        if os.path.exists(path):
+            for game in iter_games(path):
+                self.add_to_aggregates(game)
+        elif legacy_csv and os.path.exists(legacy_csv):
+            for game in import_wide_csv(legacy_csv):
+                self.add_to_aggregates(game)
+                self.pending.put(game)
+
+        self.writer = threading.Thread(target=self.write_pending, daemon=True)
+        self.writer.start()
+
+    def record(self, game_state) -> Dict:
+        """Add a finished game and return its record."""
+        with self.lock:
+            game = {
+                'game': self.game_count + 1,
+                'seed': game_state.seed,
+                'time': round(time.time(), 3),
+                'turns': game_state.turn_counter,
+                'scores': {eng.name: eng.score for eng in game_state.engineers},
+                'zombie_order': list(game_state.zombie_order),
+            }
+            self.add_to_aggregates(game)
+            # Under the lock so the file and the listeners see games in number order
+            self.pending.put(game)
+            for listener in self.listeners:
+                listener(game)
+        return game
+
+    def add_to_aggregates(self, game: Dict):
+        self.game_count = max(self.game_count, game['game'])
+        zombies = set(game.get('zombie_order', ()))
+        for name, score in game['scores'].items():
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {'games': 0, 'total': 0, 'zombified': 0}
+            stats['games'] += 1
+            stats['total'] += score
+            stats['zombified'] += name in zombies
+        self.recent.append((game['game'], game['scores']))
+
+    def write_pending(self):
+        while True:
+            batch = [self.pending.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for game in batch:
+                meta = {key: value for key, value in game.items() if key not in ('scores', 'zombie_order')}
+                zombies = game.get('zombie_order', [])
+                for name, score in game['scores'].items():
+                    zombie_rank = zombies.index(name) + 1 if name in zombies else None
+                    lines.append(json.dumps({**meta, 'name': name, 'score': score, 'zombie_rank': zombie_rank}))
+            try:
+                with open(self.path, 'a') as f:
+                    f.write('\n'.join(lines) + '\n')
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def flush(self):
+        """Block until every recorded game is on disk."""
+        self.pending.join()
+
+    def totals(self) -> Dict[str, Dict]:
+        """Per-bot games played, total and mean score, and times zombified."""
+        with self.lock:
+            return {
+                name: {**stats, 'mean': stats['total'] / stats['games']}
+                for name, stats in self.stats.items()
+            }
+
+    def wide_rows(self) -> List[Dict]:
+        """The recent games as rows of {'Name', 'Game N'..., 'Total'}, best all-time total first."""
+        with self.lock:
+            recent = list(self.recent)
+            totals = {name: stats['total'] for name, stats in self.stats.items()}
+        names = sorted({name for _, scores in recent for name in scores}, key=lambda name: -totals[name])
+        rows = []
+        for name in names:
+            row = {'Name': name}
+            for number, scores in recent:
+                row[f'Game {number}'] = scores.get(name, '')
+            row['Total'] = totals[name]
+            rows.append(row)
+        return rows
+
+    def export_wide_csv(self, path: str):
+        """Write the recent-games table in the old one-column-per-game results.csv layout.
+
+        Built from the aggregates like wide_rows, so it costs the same however
+        many games are on record; the full history is the JSONL file.
+        """
+        rows = self.wide_rows()
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['Name', 'Total'])
             writer.writeheader()
             writer.writerows(rows)
 
-    # Read and store the CSV data
-    with open(filename, 'r') as f:
-        reader = csv.DictReader(f)
-        csv_data = list(reader)
+def iter_games(path: str = RESULTS_FILE) -> Iterator[Dict]:
+    """Stream a results file back as one {'game', 'seed', ..., 'scores', 'zombie_order'} dict per game."""
+    game = None
+    ranks = {}
+    with open(path) as f:
+        for line in f:
+            row = json.loads(line)
+            if game is None or row['game'] != game['game']:
+                if game is not None:
+                    game['zombie_order'] = sorted(ranks, key=ranks.get)
+                    yield game
+                game = {key: value for key, value in row.items() if key not in ('name', 'score', 'zombie_rank')}
+                game['scores'] = {}
+                ranks = {}
+            game['scores'][row['name']] = row['score']
+            if row.get('zombie_rank') is not None:
+                ranks[row['name']] = row['zombie_rank']
+    if game is not None:
+        game['zombie_order'] = sorted(ranks, key=ranks.get)
+        yield game
+
+
+def import_wide_csv(path: str) -> Iterator[Dict]:
+    """Read the old results.csv, one column per game, as game records."""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    columns = [key for key in (rows[0] if rows else {}) if key.startswith('Game ')]
+    for column in columns:
+        scores = {row['Name']: int(row[column]) for row in rows if row.get(column)}
+        yield {'game': int(column.split()[1]), 'seed': None, 'scores': scores, 'zombie_order': []}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def results_store() -> ResultsStore:
+    """The process-wide store behind end_game, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultsStore()
+            atexit.register(_store.flush)
+        return _store
+
+
+def save_results_to_csv(self):
+    """Record a finished game and return the recent-games table shown by the client.
+
+    Kept under its old name for GameState.end_game; results now go to the
+    append-only store rather than being rewritten into results.csv.
+    """
+    results_store().record(self)
+    csv_data = results_store().wide_rows()
 
     # Store the CSV data in the game state
     self.csv_results = csv_data
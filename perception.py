@@ -0,0 +1,134 @@
+import functools
+from typing import Dict, Optional, Sequence, Tuple
+
+from threat_field import ThreatField
+
+Position = Tuple[int, int]
+
+# Bot-facing move names, as the engineer functions return them; None stays put
+MOVE_STEPS = {'up': (0, -1), 'right': (1, 0), 'down': (0, 1), 'left': (-1, 0), None: (0, 0)}
+
+
+@functools.lru_cache(maxsize=None)
+def move_options(width: int, height: int) -> Dict[Position, Dict[Optional[str], Position]]:
+    """For every cell, the moves that stay on the grid and where they lead."""
+    options = {}
+    for y in range(height):
+        for x in range(width):
+            options[(x, y)] = {
+                name: (x + dx, y + dy) for name, (dx, dy) in MOVE_STEPS.items()
+                if 0 <= x + dx < width and 0 <= y + dy < height
+            }
+    return options
+
+
+class Perception:
+    """The board as every engineer sees it on one turn, shared by the bots that take a `perception` keyword.
+
+    GameState builds one per state version, so engineers deciding against
+    the same board share it, and whatever one bot works out (distances from
+    a cell to every threat, a cell's nearest threat) is there for the next.
+    Threats are the beast followed by every zombie, as in a bot's
+    `beast_pos` argument. Distances are kept squared, as exact ints, so each
+    bot can take its own root and decide exactly as it did before.
+
+    Bots called without one build their own with `from_view`. A perception
+    describes the turn it was handed out on and shouldn't be kept past it.
+    """
+    __slots__ = ('version', 'threats', 'engineers', 'grid_size', 'turn', 'moves_table', 'field',
+                 '_squared', '_manhattan', '_nearest', '_threat_steps', '_threat_array', '_engineer_array')
+
+    def __init__(self, threats: Sequence[Position], engineers: Sequence[Position], grid_size: Tuple[int, int],
+                 turn: int = 0, version: int = 0, field: Optional[ThreatField] = None):
+        self.version = version
+        self.threats = tuple(threats)
+        self.engineers = tuple(engineers)
+        self.grid_size = tuple(grid_size)
+        self.turn = turn
+        self.moves_table = move_options(*self.grid_size)
+        # The game's ThreatField, kept current across turns; a perception without one builds its own on first use
+        self.field = field
+        self._threat_steps = None
+        self._squared: Dict[Position, Tuple[int, ...]] = {}
+        self._manhattan: Dict[Position, Tuple[int, ...]] = {}
+        self._nearest: Dict[Position, int] = {}
+        self._threat_array = None
+        self._engineer_array = None
+
+    def __reduce__(self):
+        # Worker processes get the board alone; the move table and memos are rebuilt on their side
+        return Perception, (self.threats, self.engineers, self.grid_size, self.turn, self.version)
+
+    @classmethod
+    def from_view(cls, self_pos: Position, beast_pos: Sequence[Position], other_engineers: Sequence[Position],
+                  grid_size: Tuple[int, int], turn: int = 0) -> 'Perception':
+        """A perception built from a bot's positional arguments."""
+        return cls(beast_pos, [self_pos, *other_engineers], grid_size, turn)
+
+    def moves(self, cell: Position) -> Dict[Optional[str], Position]:
+        """Move name -> destination for every move from `cell` that stays on the grid, staying put included."""
+        return self.moves_table[cell]
+
+    def squared_distances(self, cell: Position) -> Tuple[int, ...]:
+        """Squared straight-line distance from `cell` to each threat. Cells off the grid are allowed."""
+        distances = self._squared.get(cell)
+        if distances is None:
+            x, y = cell
+            distances = self._squared[cell] = tuple((x - tx) ** 2 + (y - ty) ** 2 for tx, ty in self.threats)
+        return distances
+
+    def manhattan_distances(self, cell: Position) -> Tuple[int, ...]:
+        """Step distance, ignoring walls, from `cell` to each threat."""
+        distances = self._manhattan.get(cell)
+        if distances is None:
+            x, y = cell
+            distances = self._manhattan[cell] = tuple(abs(x - tx) + abs(y - ty) for tx, ty in self.threats)
+        return distances
+
+    def nearest_threat_index(self, cell: Position) -> int:
+        """Index into `threats` of the one closest to `cell` in a straight line, the first of any tie."""
+        index = self._nearest.get(cell)
+        if index is None:
+            distances = self.squared_distances(cell)
+            index = self._nearest[cell] = distances.index(min(distances))
+        return index
+
+    def nearest_threat(self, cell: Position) -> Tuple[Position, float]:
+        """The threat closest to `cell` and its straight-line distance."""
+        index = self.nearest_threat_index(cell)
+        return self.threats[index], self.squared_distances(cell)[index] ** 0.5
+
+    @property
+    def threat_steps(self) -> Sequence[int]:
+        """Steps from every cell to the nearest threat, read-only and indexed by y * width + x."""
+        if self._threat_steps is None:
+            if self.field is None:
+                self.field = ThreatField(*self.grid_size, self.threats)
+            self._threat_steps = self.field.snapshot()
+        return self._threat_steps
+
+    def steps_to_threat(self, cell: Position) -> int:
+        """Fewest moves from `cell` to a cell holding a threat."""
+        return int(self.threat_steps[cell[0] + cell[1] * self.grid_size[0]])
+
+    @property
+    def threat_array(self):
+        """Threat positions as a read-only (n, 2) NumPy array."""
+        if self._threat_array is None:
+            self._threat_array = read_only_array(self.threats)
+        return self._threat_array
+
+    @property
+    def engineer_array(self):
+        """Engineer positions as a read-only (n, 2) NumPy array."""
+        if self._engineer_array is None:
+            self._engineer_array = read_only_array(self.engineers)
+        return self._engineer_array
+
+
+def read_only_array(positions: Tuple[Position, ...]):
+    import numpy as np
+
+    array = np.array(positions, dtype=np.int64).reshape(-1, 2)
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,166 @@
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from broadcast import Broadcaster
+from simulation import GameState
+from state_protocol import StateHistory
+
+DEFAULT_SESSION = 'default'
+
+
+class Session:
+    """One hosted game with its own lock, snapshot history and spectator stream.
+
+    `tick_rate` is None for games advanced by their clients (/update, /step),
+    otherwise the ticks per second a TickScheduler runs it at, 0 meaning as
+    fast as possible. A paused session keeps its tick_rate but is off the
+    scheduler until resumed.
+    """
+    __slots__ = ('session_id', 'game_state', 'tick_rate', 'paused', 'lock', 'last_access', '_history', '_spectators')
+
+    def __init__(self, session_id: str, game_state: GameState, tick_rate: Optional[float] = None):
+        self.session_id = session_id
+        self.game_state = game_state
+        self.tick_rate = tick_rate
+        self.paused = False
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+        # Created on first use so idle sessions stay small
+        self._history = None
+        self._spectators = None
+
+    @property
+    def history(self) -> StateHistory:
+        if self._history is None:
+            self._history = StateHistory(depth=16)
+        return self._history
+
+    @property
+    def spectators(self) -> Broadcaster:
+        if self._spectators is None:
+            self._spectators = Broadcaster()
+        return self._spectators
+
+    def has_spectators(self) -> bool:
+        return self._spectators is not None and self._spectators.subscribers > 0
+
+
+class SessionManager:
+    """Bounded table of resident games, evicted least-recently-used first.
+
+    A session is evicted when the table is full or when it has been idle for
+    `idle_timeout` seconds. Finished games are archived to `archive_dir` as
+    JSON on the way out; unfinished ones are dropped.
+    """
+
+    def __init__(self, max_sessions: int = 5000, idle_timeout: float = 3600.0, archive_dir: Optional[str] = 'archive',
+                 game_factory: Callable[..., GameState] = GameState):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.archive_dir = archive_dir
+        self.game_factory = game_factory
+        self.sessions: 'OrderedDict[str, Session]' = OrderedDict()
+        self.lock = threading.Lock()
+        # Called with each new session, e.g. by a TickScheduler to pick up auto-ticking games
+        self.listeners: List[Callable[[Session], None]] = []
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, session: Session) -> bool:
+        with self.lock:
+            return self.sessions.get(session.session_id) is session
+
+    def create(self, session_id: Optional[str] = None, tick_rate: Optional[float] = None, **game_kwargs) -> Session:
+        session_id = session_id or secrets.token_urlsafe(8)
+        session = Session(session_id, self.game_factory(**game_kwargs), tick_rate)
+        with self.lock:
+            self.sessions[session_id] = session
+            evicted = self.collect_evictions()
+        self.archive(evicted)
+        self.notify(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.last_access = time.monotonic()
+                self.sessions.move_to_end(session_id)
+            evicted = self.collect_evictions()
+        self.archive(evicted)
+        return session
+
+    def get_or_create(self, session_id: str, tick_rate: Optional[float] = None) -> Session:
+        created = False
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.game_factory(), tick_rate)
+                self.sessions[session_id] = session
+                created = True
+            else:
+                session.last_access = time.monotonic()
+                self.sessions.move_to_end(session_id)
+            evicted = self.collect_evictions()
+        self.archive(evicted)
+        if created:
+            self.notify(session)
+        return session
+
+    def notify(self, session: Session):
+        for listener in self.listeners:
+            listener(session)
+
+    def touch(self, session: Session):
+        """Mark a session as in use without looking it up, e.g. while spectators are watching."""
+        with self.lock:
+            if self.sessions.get(session.session_id) is session:
+                session.last_access = time.monotonic()
+                self.sessions.move_to_end(session.session_id)
+
+    def active(self) -> List[Session]:
+        with self.lock:
+            return list(self.sessions.values())
+
+    def collect_evictions(self) -> List[Session]:
+        # Sessions are kept in access order, so only the front ever needs checking
+        evicted = []
+        deadline = time.monotonic() - self.idle_timeout
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if len(self.sessions) <= self.max_sessions and session.last_access >= deadline:
+                break
+            self.sessions.popitem(last=False)
+            evicted.append(session)
+        return evicted
+
+    def archive(self, sessions: List[Session]):
+        for session in sessions:
+            if session.has_spectators():
+                session.spectators.close()
+            game_state = session.game_state
+            if not self.archive_dir or not game_state.game_over:
+                continue
+            os.makedirs(self.archive_dir, exist_ok=True)
+            record = {
+                'session_id': session.session_id,
+                'roster': [name for name, _, _ in game_state.roster],
+                **game_state.results(),
+            }
+            path = os.path.join(self.archive_dir, f'{session.session_id}.json')
+            with open(path, 'w') as f:
+                json.dump(record, f)
+
+    @staticmethod
+    def load_archived(archive_dir: str, session_id: str) -> Optional[Dict]:
+        path = os.path.join(archive_dir, f'{session_id}.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
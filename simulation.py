@@ -1,27 +1,50 @@
 import random
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import math
+import bisect
+import concurrent.futures
+import functools
+import inspect
 from enum import Enum, auto
 from dataclasses import dataclass, field
 import time
 import csv
 import os
+from collections import Counter
 from outputs import save_results_to_csv
-from engineer_functions import *
-
-# Game constants
-GRID_WIDTH, GRID_HEIGHT = 12, 10
+from bitboard import Bitboard
+from game_log import CONSOLE_LOG, DEBUG, INFO, NULL_LOG, WARNING, EventLogger
+from metrics import Metrics
+from game_config import BEAST_WANDER, DEFAULT_CONFIG, GameConfig, beast_moves_at, beast_schedule
+from bot_registry import BUILTIN_BOTS, bot_arity, default_roster, is_pure
+from bot_cache import MISSING, bot_cache
+from perception import Perception
+from threat_field import ThreatField
+
+# Game constants; the rules themselves live in GameConfig and these are the defaults
+GRID_WIDTH, GRID_HEIGHT = DEFAULT_CONFIG.grid_size
 NUM_ENGINEERS = 5
-ENGINEER_EMOJIS = ['🥺', '😈', '🦾', '🦹‍♂️', '🎃', '🐔', '☘️', '🦤', '💃', '😨']
-ENGINEER_NAMES = ['rapid ryan', 'Saboteur', 'Random Savage', 'Mr Sinister', 'mui_shaggy', 'Leeroy', 'Leprechaun', 'Brave Sir Robin', 'Edgy Engineer', 'Aaahhhhh']
+ENGINEER_EMOJIS = [spec.emoji for spec in BUILTIN_BOTS]
+ENGINEER_NAMES = [spec.name for spec in BUILTIN_BOTS]
 ZOMBIE_EMOJI = '🧟'
 BEAST_EMOJI = '🐺'
-BEAST_DETECTION_RADIUS = 5
-ZOMBIE_DETECTION_RADIUS = 5
-BEAST_APPEARS = 4
-BEAST_MOVEMENT = [6, 8, 10]
-END_GAME_TURNS = 50
-BEAST_BEAST_MODE = True
+BEAST_DETECTION_RADIUS = DEFAULT_CONFIG.beast_detection_radius
+ZOMBIE_DETECTION_RADIUS = DEFAULT_CONFIG.zombie_detection_radius
+BEAST_APPEARS = DEFAULT_CONFIG.beast_appears
+BEAST_MOVEMENT = list(DEFAULT_CONFIG.beast_movement)
+END_GAME_TURNS = DEFAULT_CONFIG.end_game_turns
+BEAST_BEAST_MODE = DEFAULT_CONFIG.beast_beast_mode
+# A roster is a list of (name, emoji, ai_function) triples; see bot_registry.roster
+
+
+def __getattr__(name: str):
+    # The built-in bots are only imported once something asks for them
+    if name == 'DEFAULT_ROSTER':
+        return default_roster()
+    if name == 'ENGINEER_FUNCTIONS':
+        return [ai_function for _, _, ai_function in default_roster()]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 class Direction(Enum):
     UP = auto()
@@ -42,13 +65,85 @@ class GamePhase(Enum):
 
 Position = Tuple[int, int]
 
-@dataclass
+
+@functools.lru_cache(maxsize=None)
+def move_table(width: int, height: int) -> Dict[Tuple[Position, Direction], Position]:
+    """Destination of every in-bounds single step on a width x height grid."""
+    steps = {Direction.UP: (0, -1), Direction.DOWN: (0, 1), Direction.LEFT: (-1, 0), Direction.RIGHT: (1, 0)}
+    table = {}
+    for y in range(height):
+        for x in range(width):
+            for direction, (dx, dy) in steps.items():
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    table[((x, y), direction)] = (x + dx, y + dy)
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def pursuit_table(width: int, height: int) -> Tuple[Tuple[Direction, ...], ...]:
+    """The step a hunter takes towards a target offset by (dx, dy), read as table[dy][dx].
+
+    It closes the larger gap, the vertical one on a tie, and UP on the target's
+    own cell. Negative offsets index from the end of each row and of the table,
+    so any offset on the grid is a plain lookup.
+    """
+    def step(dx: int, dy: int) -> Direction:
+        if abs(dx) > abs(dy):
+            return Direction.RIGHT if dx > 0 else Direction.LEFT
+        return Direction.DOWN if dy > 0 else Direction.UP
+
+    offsets = lambda size: list(range(size)) + list(range(-(size - 1), 0))
+    return tuple(tuple(step(dx, dy) for dx in offsets(width)) for dy in offsets(height))
+
+
+# A spiral search turns clockwise, and its legs grow by one after each turn out of DOWN or UP
+SPIRAL_TURN = {Direction.RIGHT: Direction.DOWN, Direction.DOWN: Direction.LEFT,
+               Direction.LEFT: Direction.UP, Direction.UP: Direction.RIGHT}
+SPIRAL_WIDENS = {Direction.RIGHT: 0, Direction.DOWN: 1, Direction.LEFT: 0, Direction.UP: 1}
+
+
+@functools.lru_cache(maxsize=None)
+def spiral_turns(width: int, height: int) -> Dict[Tuple[Position, Direction], Tuple[Direction, int]]:
+    """For a spiral heading off the grid from a cell, the first heading that stays on it and how much the legs grew.
+
+    Headings that stay on the grid aren't in the table.
+    """
+    moves = move_table(width, height)
+    table = {}
+    for y in range(height):
+        for x in range(width):
+            for heading in SPIRAL_TURN:
+                direction, widened = heading, 0
+                # Four turns come back round, which only happens on a 1x1 grid
+                for _ in range(4):
+                    if ((x, y), direction) in moves:
+                        break
+                    widened += SPIRAL_WIDENS[direction]
+                    direction = SPIRAL_TURN[direction]
+                if direction is not heading:
+                    table[((x, y), heading)] = (direction, widened)
+    return table
+
+# Entities are slotted: no per-instance __dict__, which matters when thousands of games are resident
+@dataclass(slots=True)
 class DetectedEngineer:
     name: str
     position: Position
     detected_turn: int
 
-@dataclass
+@dataclass(slots=True)
+class SpiralSearch:
+    """One hunter's place in its spiral search: heading, length of the current leg, and steps taken along it."""
+    direction: Direction = Direction.RIGHT
+    leg: int = 1
+    taken: int = 0
+
+    def turn(self):
+        self.taken = 0
+        self.leg += SPIRAL_WIDENS[self.direction]
+        self.direction = SPIRAL_TURN[self.direction]
+
+@dataclass(slots=True)
 class Entity:
     position: Position
     emoji: str
@@ -60,31 +155,30 @@ class Entity:
     ai_function: callable = None
     score: int = 0
     detected_engineers: List[DetectedEngineer] = field(default_factory=list)
+    entity_id: int = 0  # index into GameState.entities; the beast is 0
+    search: Optional[SpiralSearch] = None  # the beast's and each zombie's own spiral
 
 
-@dataclass
+@dataclass(slots=True)
 class Grid:
     width: int
     height: int
+    moves: Dict[Tuple[Position, Direction], Position] = field(init=False, repr=False, compare=False)
+    pursuit: Tuple[Tuple[Direction, ...], ...] = field(init=False, repr=False, compare=False)
+    spiral_turns: Dict[Tuple[Position, Direction], Tuple[Direction, int]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.moves = move_table(self.width, self.height)
+        self.pursuit = pursuit_table(self.width, self.height)
+        self.spiral_turns = spiral_turns(self.width, self.height)
 
     def is_valid_position(self, pos: Position) -> bool:
         x, y = pos
         return 0 <= x < self.width and 0 <= y < self.height
 
     def move(self, pos: Position, direction: Direction) -> Position:
-        x, y = pos
-        if direction == Direction.UP:
-            new_pos = (x, y - 1)
-        elif direction == Direction.DOWN:
-            new_pos = (x, y + 1)
-        elif direction == Direction.LEFT:
-            new_pos = (x - 1, y)
-        elif direction == Direction.RIGHT:
-            new_pos = (x + 1, y)
-        else:
-            return pos # Default case if an invalid direction
-        
-        return new_pos if self.is_valid_position(new_pos) else pos
+        # Off-grid steps and anything that isn't a Direction leave the position unchanged
+        return self.moves.get((pos, direction), pos)
 
     @staticmethod
     def distance(pos1: Position, pos2: Position) -> float:
@@ -93,8 +187,42 @@ class Grid:
 
 
 class GameState:
-    def __init__(self):
-        self.grid = Grid(GRID_WIDTH, GRID_HEIGHT)
+    def __init__(self, headless: bool = False, seed: Optional[int] = None, roster: Optional[List[Tuple[str, str, callable]]] = None,
+                 bitboard: bool = False, log: Optional[EventLogger] = None, metrics: Optional[Metrics] = None,
+                 bot_executor=None, simultaneous: bool = False,
+                 decision_pool: Optional[concurrent.futures.Executor] = None, config: Optional[GameConfig] = None,
+                 memoize: bool = False):
+        # Headless games skip the wall-clock throttle, logging and the CSV write
+        self.headless = headless
+        # Pass EventLogger.ring() to keep a post-mortem trace of one game
+        self.log = log if log is not None else NULL_LOG if headless else CONSOLE_LOG
+        # Latency histograms for AI calls and game phases; None turns the timing hooks off
+        self.metrics = metrics
+        # e.g. a bot_workers.BotWorkerPool, to run engineer functions out of process with a deadline
+        self.bot_executor = bot_executor
+        # Simultaneous games move every human engineer at once, decided in parallel on `decision_pool`
+        self.simultaneous = simultaneous
+        self.decision_pool = decision_pool
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.beast_schedule = beast_schedule(self.config)
+        # Every random draw in a game comes from this stream, so (seed, roster) replays the game exactly
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.roster = list(roster) if roster is not None else default_roster()
+        # One shared kwargs dict per kind rather than one per engineer
+        rng_kwargs, no_kwargs = {'rng': self.rng}, {}
+        self.bot_kwargs = {name: rng_kwargs if accepts_rng(ai_func) else no_kwargs for name, _, ai_func in self.roster}
+        # Bots that take a `perception` get the board's shared Perception, built at most once per version
+        self.perception_bots = frozenset(name for name, _, ai_func in self.roster if accepts_perception(ai_func))
+        # Bots declared with a fifth positional argument also get the turn counter
+        self.turn_aware = frozenset(name for name, _, ai_func in self.roster if bot_arity(ai_func) > 4)
+        # With memoize, pure bots answer states seen before from a process-wide cache (bot_cache); worth it for
+        # replays and repeated seeds, where states recur. Out-of-process calls can fail, so aren't cached
+        self.memoize = memoize
+        self.bot_caches = {name: bot_cache(ai_func) for name, _, ai_func in self.roster
+                           if memoize and bot_executor is None and memoizable(ai_func)}
+        self._perception = None
+        self.grid = Grid(self.config.grid_width, self.config.grid_height)
         self.engineers = self.create_engineers()
         self.beast = self.create_beast()
         self.turn_counter = 0
@@ -102,16 +230,28 @@ class GameState:
         self.phase = GamePhase.SETUP
         self.entities = [self.beast] + self.engineers
         self.current_turn_index = 0
+        # Bumped on every entity turn; clients use it to ask for changes since a version
+        self.version = 0
         self.last_update_time = time.time()
         self.update_interval = 0.1
         self.beast_target = {}
-        self.spiral_direction = Direction.RIGHT
-        self.spiral_steps = 1
-        self.steps_taken = 0
         self.score_counter = 1
         self.game_over = False
         self.csv_results = []
-        self.end_game_turns = END_GAME_TURNS
+        self.end_game_turns = self.config.end_game_turns
+        # Optional occupancy masks that turn collision and detection checks into bit operations
+        self.bitboard = self.create_bitboard() if bitboard else None
+        # Derived views, kept current by move_entity, set_phase and turn_engineer_into_zombie
+        self.engineer_positions = [eng.position for eng in self.engineers]
+        self.zombies = []
+        self.alive_count = len(self.engineers)
+        self.engineer_cells = Counter(self.engineer_positions)
+        self.zombie_cells = Counter()
+        # Cells where a live engineer shares a cell with a zombie or the visible beast
+        self.contested = set()
+        self._threat_positions = None
+        # Steps from each cell to the nearest threat, for bots that read it through their perception
+        self.threat_field = ThreatField(self.grid.width, self.grid.height, self.threat_positions())
         
     
     def create_beast(self) -> Entity:
@@ -123,50 +263,131 @@ class GameState:
                     emoji=BEAST_EMOJI,
                     name='Beast',
                     entity_type=EntityType.BEAST,
-                    ai_function=self.beast_ai
+                    ai_function=self.beast_ai,
+                    search=SpiralSearch()
                 )
 
+    def create_bitboard(self) -> Bitboard:
+        board = Bitboard(self.grid.width, self.grid.height)
+        for eng in self.engineers:
+            if eng.entity_type == EntityType.ENGINEER and eng.alive:
+                board.add_engineer(eng.position)
+        return board
+
     def create_engineers(self) -> List[Entity]:
-        ai_functions = [rapid_ryan, saboteur, randomy_savage, mr_sinister, mui_shaggy, leeroy, leprechaun, brave_sir_robin, edgy_engineer, aaahhhhh]
         return [
             Entity(
                 position=self.random_position(),
                 emoji=emoji,
                 name=name,
                 entity_type=EntityType.ENGINEER,
-                ai_function=ai_func
+                ai_function=ai_func,
+                entity_id=entity_id
             )
-            for emoji, name, ai_func in zip(ENGINEER_EMOJIS, ENGINEER_NAMES, ai_functions)
+            for entity_id, (name, emoji, ai_func) in enumerate(self.roster, start=1)
         ]
 
 
     def random_position(self) -> Position:
-        return (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
+        return (self.rng.randint(0, self.grid.width - 1), self.rng.randint(0, self.grid.height - 1))
 
     def update(self) -> bool:
         current_time = time.time()
-        print(self.phase)
-        if current_time - self.last_update_time < self.update_interval:
-            return False
+        if not self.headless:
+            if self.log.debug_on:
+                self.log.emit(DEBUG, 'update', phase=self.phase)
+            if current_time - self.last_update_time < self.update_interval:
+                return False
         
+        if not self.step():
+            return False
+
+        self.last_update_time = current_time
+        return True
+
+    def step(self) -> bool:
+        """Advance a single entity turn, ignoring the wall-clock throttle."""
         if self.phase == GamePhase.GAME_OVER:
             if not self.game_over:
                 self.end_game()
             return False
 
-        self.update_current_entity()
+        metrics = self.metrics
+        engineer_phase = self.simultaneous and self.current_turn_index == 1
+        if metrics is not None:
+            if engineer_phase:
+                phase = 'engineer_phase'
+            else:
+                phase = f'{self.entities[self.current_turn_index].entity_type.name.lower()}_turn'
+            start = time.perf_counter()
+        if engineer_phase:
+            self.update_engineers_simultaneously()
+            if self.entities[1].entity_type == EntityType.ZOMBIE:
+                self.update_zombie(self.entities[1])
+        else:
+            self.update_current_entity()
+        if metrics is not None:
+            collisions_start = time.perf_counter()
+            metrics.observe_phase(phase, collisions_start - start)
         self.check_collisions()
+        if metrics is not None:
+            metrics.observe_phase('check_collisions', time.perf_counter() - collisions_start)
         self.update_game_phase()
         self.advance_turn()
-
-        self.last_update_time = current_time
+        if self.simultaneous:
+            # Humans already moved in this round's engineer phase
+            while self.current_turn_index > 1 and self.entities[self.current_turn_index].entity_type == EntityType.ENGINEER:
+                self.advance_turn()
+        self.version += 1
         return True
+
+    def run_to_completion(self, max_rounds: Optional[int] = None) -> Dict:
+        """Step the game in a tight loop until it ends or max_rounds full rounds have run.
+
+        Throughput is bound by the Python bots' own cost, not by this loop.
+        batch_engine.run_batch plays many games in lockstep and reaches
+        thousands per second when every bot in the roster has an array
+        implementation (batch_engine.VECTORIZED_BOTS); other bots are still
+        called once per game there.
+        """
+        last_round = None if max_rounds is None else self.turn_counter + max_rounds
+        while self.phase != GamePhase.GAME_OVER:
+            if last_round is not None and self.turn_counter >= last_round:
+                break
+            self.step()
+        return self.results()
+
+    def results(self) -> Dict:
+        return {
+            'seed': self.seed,
+            'scores': {eng.name: eng.score for eng in self.engineers},
+            'zombie_order': list(self.zombie_order),
+            'turns': self.turn_counter,
+            'game_over': self.game_over,
+        }
     
+    def frame(self) -> List:
+        """Compact snapshot for playback: [turn, entity index, beast or None, [[x, y, is_zombie], ...]]."""
+        return [
+            self.turn_counter,
+            self.current_turn_index,
+            self.beast.position if self.phase == GamePhase.BEAST_VISIBLE else None,
+            [[eng.position[0], eng.position[1], int(eng.entity_type == EntityType.ZOMBIE)] for eng in self.engineers],
+        ]
+
     def end_game(self):
+        if self.metrics is not None:
+            start = time.perf_counter()
         self.calculate_final_scores()
-        print('game ended!')
         self.game_over = True
-        self.csv_results = save_results_to_csv(self)
+        # Final scores change the state without a move, so snapshots must see a new version
+        self.version += 1
+        if self.log.info_on:
+            self.log.emit(INFO, 'game_over', seed=self.seed, turns=self.turn_counter, zombie_order=tuple(self.zombie_order))
+        if not self.headless:
+            self.csv_results = save_results_to_csv(self)
+        if self.metrics is not None:
+            self.metrics.observe_phase('end_game', time.perf_counter() - start)
 
     def update_current_entity(self):
         entity = self.entities[self.current_turn_index]
@@ -177,100 +398,209 @@ class GameState:
         elif entity.entity_type == EntityType.ZOMBIE:
             self.update_zombie(entity)
 
-    def get_beast_move_frequency(self) -> int:
-        if self.turn_counter < BEAST_MOVEMENT[1]:
-            return 2
-        elif self.turn_counter < BEAST_MOVEMENT[2]:
-            return 3
-        else:
-            return 1
-
     def update_engineer(self, engineer: Entity):
         if not engineer.alive:
             return
-
-        other_engineers = [e.position for e in self.engineers if e != engineer]
-        beast_positions = [self.beast.position] + [e.position for e in self.entities if e.entity_type == EntityType.ZOMBIE]
-        if engineer.name == 'Leeroy':
-            direction = engineer.ai_function(engineer.position, beast_positions, 
-            other_engineers, (GRID_WIDTH, GRID_HEIGHT), self.turn_counter)
-        elif engineer.name == 'Aaahhhhh':
-            direction = engineer.ai_function(engineer.position, beast_positions, 
-            other_engineers, (GRID_WIDTH, GRID_HEIGHT), self.turn_counter)
+        direction = self.decide(engineer, self.engineer_view(engineer), self.bot_kwargs[engineer.name])
+        self.apply_direction(engineer, direction)
+
+    def update_engineers_simultaneously(self):
+        """Every human decides against the same board, in parallel, then all moves are applied.
+
+        Humans never block each other, and threats hold still during this
+        phase, so the outcome doesn't depend on the order moves are applied
+        in: whoever ends on a zombie or the visible beast is caught by the
+        single collision check that follows.
+        """
+        calls = []
+        for engineer in self.engineers:
+            if engineer.entity_type != EntityType.ENGINEER or not engineer.alive:
+                continue
+            bot_kwargs = self.bot_kwargs[engineer.name]
+            if 'rng' in bot_kwargs:
+                # Draw per-bot streams up front, in roster order, so threads can't reorder the game's draws
+                bot_kwargs = {**bot_kwargs, 'rng': random.Random(self.rng.getrandbits(64))}
+            calls.append((engineer, self.engineer_view(engineer), bot_kwargs))
+        if self.perception_bots:
+            # Built here rather than racing to build it in every thread
+            self.perception()
+        pool = self.decision_pool or shared_decision_pool()
+        directions = list(pool.map(lambda call: self.decide(*call), calls))
+        for (engineer, _, _), direction in zip(calls, directions):
+            self.apply_direction(engineer, direction)
+
+    def perception(self) -> Perception:
+        """The shared Perception of the board as it stands, rebuilt only once the version moves on."""
+        perception = self._perception
+        if perception is None or perception.version != self.version:
+            perception = self._perception = Perception(self.threat_positions(), self.engineer_positions,
+                                                       (self.grid.width, self.grid.height), self.turn_counter,
+                                                       self.version, self.threat_field)
+        return perception
+
+    def engineer_view(self, engineer: Entity) -> Tuple:
+        """Positional arguments for the engineer's bot: own position, threats, other engineers, grid size."""
+        index = engineer.entity_id - 1
+        other_engineers = self.engineer_positions[:index] + self.engineer_positions[index + 1:]
+        beast_positions = list(self.threat_positions())
+        args = (engineer.position, beast_positions, other_engineers, (self.grid.width, self.grid.height))
+        if engineer.name in self.turn_aware:
+            args += (self.turn_counter,)
+        return args
+
+    def decide(self, engineer: Entity, args: Tuple, bot_kwargs: Dict) -> Direction:
+        cache = self.bot_caches.get(engineer.name)
+        if cache is not None:
+            key = cache.key(args)
+            direction = cache.get(key)
+            if direction is not MISSING:
+                # Not an AI call, so not timed
+                return direction
+        if engineer.name in self.perception_bots:
+            bot_kwargs = {**bot_kwargs, 'perception': self.perception()}
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        if self.bot_executor is None:
+            direction = engineer.ai_function(*args, **bot_kwargs)
         else:
-            direction = engineer.ai_function(engineer.position, beast_positions, 
-            other_engineers, (GRID_WIDTH, GRID_HEIGHT))
-        
+            direction = self.bot_executor.move(engineer.ai_function, args, bot_kwargs)
+        if metrics is not None:
+            metrics.observe_bot(engineer.name, time.perf_counter() - start)
+        if cache is not None:
+            cache.put(key, direction)
+        return direction
+
+    def apply_direction(self, engineer: Entity, direction):
         if isinstance(direction, Direction):
-            engineer.position = self.grid.move(engineer.position, direction)
+            self.move_entity(engineer, direction)
         elif direction == None:
-            engineer.position = self.grid.move(engineer.position, None)
+            self.move_entity(engineer, None)
         elif isinstance(direction, str):
             direction_enum = self.string_to_direction(direction)
             if direction_enum:
-                engineer.position = self.grid.move(engineer.position, direction_enum)
-            else:
-                print(f"Warning: Invalid direction string '{direction}' returned by AI for engineer {engineer.name}")
-        else:
-            print(f"Warning: Invalid direction type returned by AI for engineer {engineer.name}")
+                self.move_entity(engineer, direction_enum)
+            elif self.log.warning_on:
+                self.log.emit(WARNING, 'invalid_direction', engineer=engineer.name, direction=direction)
+        elif self.log.warning_on:
+            self.log.emit(WARNING, 'invalid_direction', engineer=engineer.name, direction=direction)
 
     def update_beast(self):
-        if self.turn_counter < BEAST_MOVEMENT[0]:
+        turn = self.turn_counter
+        if turn < self.config.beast_movement[0]:
             return
-        move_frequency = self.get_beast_move_frequency()
-        if self.turn_counter % move_frequency == 0:
-            if self.turn_counter % 5 == 3:
-                direction = random.choice(list(Direction))
+        moves = self.beast_schedule[turn] if turn < len(self.beast_schedule) else beast_moves_at(self.config, turn)
+        for move in moves:
+            if move == BEAST_WANDER:
+                direction = self.rng.choice(list(Direction))
             else:
-                direction = self.beast_ai(self.beast)
-            self.beast.position = self.grid.move(self.beast.position, direction)
-        
-        if self.turn_counter % 5 == 0:
-            direction = self.beast_ai(self.beast)
-            self.beast.position = self.grid.move(self.beast.position, direction)
-
-        if BEAST_BEAST_MODE:
-            if self.turn_counter % 5 == 2:
-                direction = self.beast_ai(self.beast)
-                self.beast.position = self.grid.move(self.beast.position, direction)
+                direction = self.hunter_direction(self.beast)
+            self.move_entity(self.beast, direction)
 
+        if turn >= self.config.beast_appears:
+            self.set_phase(GamePhase.BEAST_VISIBLE)
 
-        if self.turn_counter >= BEAST_APPEARS:
-            self.phase = GamePhase.BEAST_VISIBLE
+    def hunter_direction(self, entity: Entity) -> Direction:
+        """beast_ai for the beast or a zombie, timed as the 'Beast' or 'Zombie' bot when metrics are on."""
+        if self.metrics is None:
+            return self.beast_ai(entity)
+        start = time.perf_counter()
+        direction = self.beast_ai(entity)
+        self.metrics.observe_bot('Beast' if entity is self.beast else 'Zombie', time.perf_counter() - start)
+        return direction
 
     def update_zombie(self, zombie: Entity):
         if self.turn_counter - zombie.last_moved >= 2:
-            direction = self.beast_ai(zombie)
-            zombie.position = self.grid.move(zombie.position, direction)
+            direction = self.hunter_direction(zombie)
+            self.move_entity(zombie, direction)
             zombie.last_moved = self.turn_counter
 
-    def check_collisions(self):
-        for engineer in self.engineers:
-            if engineer.alive and engineer.entity_type == EntityType.ENGINEER:
-                if engineer.position == self.beast.position and self.phase == GamePhase.BEAST_VISIBLE:
-                    self.turn_engineer_into_zombie(engineer)
-                elif any(zombie.position == engineer.position for zombie in self.entities if zombie.entity_type == EntityType.ZOMBIE):
-                    self.turn_engineer_into_zombie(engineer)
+    def move_entity(self, entity: Entity, direction: Direction):
+        old_position = entity.position
+        new_position = self.grid.move(old_position, direction)
+        if new_position == old_position:
+            return
+        if self.bitboard is not None and entity.entity_type == EntityType.ENGINEER and entity.alive:
+            self.bitboard.move_engineer(old_position, new_position)
+        entity.position = new_position
+
+        if entity.entity_type == EntityType.BEAST:
+            self._threat_positions = None
+            self.threat_field.move(old_position, new_position)
+        else:
+            self.engineer_positions[entity.entity_id - 1] = new_position
+            if entity.entity_type == EntityType.ZOMBIE:
+                self._threat_positions = None
+                self.threat_field.move(old_position, new_position)
+                self.move_count(self.zombie_cells, old_position, new_position)
+            elif entity.alive:
+                self.move_count(self.engineer_cells, old_position, new_position)
+            else:
+                return
+        self.refresh_contested(old_position)
+        self.refresh_contested(new_position)
 
+    @staticmethod
+    def move_count(cells: Counter, old_position: Position, new_position: Position):
+        cells[old_position] -= 1
+        if not cells[old_position]:
+            del cells[old_position]
+        cells[new_position] += 1
+
+    def refresh_contested(self, cell: Position):
+        if cell in self.engineer_cells and (cell in self.zombie_cells or
+                                            (cell == self.beast.position and self.phase == GamePhase.BEAST_VISIBLE)):
+            self.contested.add(cell)
+        else:
+            self.contested.discard(cell)
+
+    def set_phase(self, phase: GamePhase):
+        if phase != self.phase:
+            self.phase = phase
+            self.refresh_contested(self.beast.position)
 
+    def threat_positions(self) -> List[Position]:
+        """The beast then every zombie in entity order, rebuilt only after one of them moves."""
+        if self._threat_positions is None:
+            self._threat_positions = [self.beast.position] + [zombie.position for zombie in self.zombies]
+        return self._threat_positions
 
+    def check_collisions(self):
+        # Only contested cells can hold a collision, so a quiet turn costs nothing
+        if not self.contested:
+            return
+        caught = [eng for eng in self.engineers
+                  if eng.alive and eng.entity_type == EntityType.ENGINEER and eng.position in self.contested]
+        for engineer in caught:
+            self.turn_engineer_into_zombie(engineer)
 
     def update_game_phase(self):
-        if self.turn_counter == BEAST_APPEARS:
-            self.phase = GamePhase.BEAST_VISIBLE
-        elif all(eng.entity_type == EntityType.ZOMBIE or not eng.alive for eng in self.engineers) or \
-            self.turn_counter >= END_GAME_TURNS or \
-            sum(1 for eng in self.engineers if eng.entity_type == EntityType.ENGINEER and eng.alive) <= 1:
-                self.phase = GamePhase.GAME_OVER
-                self.end_game()
+        if self.turn_counter == self.config.beast_appears:
+            self.set_phase(GamePhase.BEAST_VISIBLE)
+        elif self.alive_count <= 1 or self.turn_counter >= self.config.end_game_turns:
+            self.set_phase(GamePhase.GAME_OVER)
+            self.end_game()
 
 
 
 
     def turn_engineer_into_zombie(self, engineer: Entity):
+        if self.bitboard is not None:
+            self.bitboard.remove_engineer(engineer.position)
+        if engineer.alive:
+            self.alive_count -= 1
+            self.engineer_cells[engineer.position] -= 1
+            if not self.engineer_cells[engineer.position]:
+                del self.engineer_cells[engineer.position]
+        self.zombie_cells[engineer.position] += 1
+        bisect.insort(self.zombies, engineer, key=lambda zombie: zombie.entity_id)
+        self._threat_positions = None
+        self.threat_field.add(engineer.position)
+        self.refresh_contested(engineer.position)
         engineer.entity_type = EntityType.ZOMBIE
         engineer.emoji = ZOMBIE_EMOJI
         engineer.ai_function = self.beast_ai
+        engineer.search = SpiralSearch()
         self.zombie_order.append(engineer.name)
         engineer.score = self.score_counter
         self.score_counter += 1
@@ -287,77 +617,73 @@ class GameState:
         self.current_turn_index = (self.current_turn_index + 1) % len(self.entities)
         if self.current_turn_index == 0:
             self.turn_counter += 1
-    def get_nearby_engineers(self, entity: Entity, radius: int) -> List[DetectedEngineer]:
-        nearby = []
+    def detect_target(self, entity: Entity, radius: int) -> Optional[DetectedEngineer]:
+        """Refresh what `entity` has detected within `radius`, and pick the engineer to chase.
+
+        entity.detected_engineers keeps the live engineers in range, in the
+        order they were first seen. The target is the most recently detected
+        of them, the earliest in the roster on a tie.
+        """
+        if self.bitboard is not None:
+            hits = self.bitboard.detected(entity.position, radius)
+            if not hits:
+                entity.detected_engineers = []
+                return None
+            contains = self.bitboard.contains
+        x, y = entity.position
+        reach = radius * radius
+        known = {de.name: de for de in entity.detected_engineers}
+        found = []
+        target = None
         for eng in self.engineers:
-            if eng.entity_type == EntityType.ENGINEER and eng.alive and self.grid.distance(entity.position, eng.position) <= radius:
-                detected_eng = next((de for de in entity.detected_engineers if de.name == eng.name), None)
-                if detected_eng:
-                    detected_eng.position = eng.position
-                else:
-                    detected_eng = DetectedEngineer(eng.name, eng.position, self.turn_counter)
-                    entity.detected_engineers.append(detected_eng)
-                nearby.append(detected_eng)
+            if eng.entity_type != EntityType.ENGINEER or not eng.alive:
+                continue
+            position = eng.position
+            if self.bitboard is not None:
+                if not contains(hits, position):
+                    continue
+            elif (position[0] - x) ** 2 + (position[1] - y) ** 2 > reach:
+                continue
+            detected_eng = known.pop(eng.name, None)
+            if detected_eng is None:
+                detected_eng = DetectedEngineer(eng.name, position, self.turn_counter)
+                found.append(detected_eng)
             else:
-                entity.detected_engineers = [de for de in entity.detected_engineers if de.name != eng.name]
-
-        return sorted(nearby, key=lambda x: x.detected_turn, reverse=True)
+                detected_eng.position = position
+            if target is None or detected_eng.detected_turn > target.detected_turn:
+                target = detected_eng
+        if known or found:
+            # Whatever is left in `known` went out of range, died or turned
+            entity.detected_engineers = [de for de in entity.detected_engineers if de.name not in known] + found
+        return target
 
     def beast_ai(self, entity: Entity) -> Direction:
-        nearby_engineers = self.get_nearby_engineers(entity, BEAST_DETECTION_RADIUS if entity.entity_type == EntityType.BEAST else ZOMBIE_DETECTION_RADIUS)
-        
-        if nearby_engineers:
-            print('--------')
-            print(entity.name)
-            print(nearby_engineers)
-            target_eng = nearby_engineers[0]
-            self.beast_target[entity.name] = target_eng.name
-            target_pos = target_eng.position
-
-            dx = target_pos[0] - entity.position[0]
-            dy = target_pos[1] - entity.position[1]
-
-            if abs(dx) > abs(dy):
-                return Direction.RIGHT if dx > 0 else Direction.LEFT
-            else:
-                return Direction.DOWN if dy > 0 else Direction.UP
-        
-        # If no engineers are nearby, use a spiral search pattern
-        next_position = self.get_next_spiral_position(entity.position)
-        while not self.grid.is_valid_position(next_position):
-            self.update_spiral_direction()
-            next_position = self.get_next_spiral_position(entity.position)
-
-        self.steps_taken += 1
-        if self.steps_taken == self.spiral_steps:
-            self.update_spiral_direction()
+        config = self.config
+        radius = config.beast_detection_radius if entity.entity_type == EntityType.BEAST else config.zombie_detection_radius
+        target = self.detect_target(entity, radius)
+
+        if target is not None:
+            if self.log.debug_on:
+                # Plain values, not the DetectedEngineer, which later turns update in place
+                self.log.emit(DEBUG, 'chase', turn=self.turn_counter, entity=entity.name, target=target.name,
+                              position=tuple(target.position), seen_turn=target.detected_turn)
+            self.beast_target[entity.name] = target.name
+            x, y = entity.position
+            return self.grid.pursuit[target.position[1] - y][target.position[0] - x]
+
+        # If no engineers are nearby, carry on with this hunter's spiral search, turning away from the edges
+        search = entity.search
+        turn = self.grid.spiral_turns.get((entity.position, search.direction))
+        if turn is not None:
+            search.direction, widened = turn
+            search.leg += widened
+            search.taken = 0
+        search.taken += 1
+        if search.taken == search.leg:
+            search.turn()
 
         self.beast_target[entity.name] = None
-        return self.spiral_direction
-
-    def get_next_spiral_position(self, current_position: Position) -> Position:
-        x, y = current_position
-        if self.spiral_direction == Direction.RIGHT:
-            return (x + 1, y)
-        elif self.spiral_direction == Direction.DOWN:
-            return (x, y + 1)
-        elif self.spiral_direction == Direction.LEFT:
-            return (x - 1, y)
-        else:  # Direction.UP
-            return (x, y - 1)
-
-    def update_spiral_direction(self):
-        self.steps_taken = 0
-        if self.spiral_direction == Direction.RIGHT:
-            self.spiral_direction = Direction.DOWN
-        elif self.spiral_direction == Direction.DOWN:
-            self.spiral_direction = Direction.LEFT
-            self.spiral_steps += 1
-        elif self.spiral_direction == Direction.LEFT:
-            self.spiral_direction = Direction.UP
-        else:  # Direction.UP
-            self.spiral_direction = Direction.RIGHT
-            self.spiral_steps += 1
+        return search.direction
 
     @staticmethod
     def string_to_direction(direction_str: str) -> Direction:
@@ -370,7 +696,9 @@ class GameState:
         return direction_map.get(direction_str.lower(), None)
 
     def to_dict(self) -> Dict:
-        return {
+        if self.metrics is not None:
+            start = time.perf_counter()
+        state = {
             'beast': self.beast.position if self.phase == GamePhase.BEAST_VISIBLE else None,
             'engineers': [
                 {
@@ -387,10 +715,10 @@ class GameState:
             'turn_counter': self.turn_counter,
             'grid_size': (self.grid.width, self.grid.height),
             'game_over': self.phase == GamePhase.GAME_OVER,
-            'zombie_order': self.zombie_order,
+            'zombie_order': list(self.zombie_order),
             'beast_hidden': self.phase == GamePhase.BEAST_HIDDEN,
             'current_turn_entity': self.entities[self.current_turn_index].name,
-            'beast_target': self.beast_target,
+            'beast_target': dict(self.beast_target),
             'detected_engineers': {
                 entity.name: [
                     {'name': de.name, 'position': de.position, 'detected_turn': de.detected_turn}
@@ -401,6 +729,61 @@ class GameState:
             'csv_results': self.csv_results,
             'end_game_turns': self.end_game_turns,
         }
+        if self.metrics is not None:
+            self.metrics.observe_phase('to_dict', time.perf_counter() - start)
+        return state
 
     def reset(self):
-        self.__init__()
+        self.__init__(headless=self.headless, roster=self.roster, bitboard=self.bitboard is not None, log=self.log,
+                      metrics=self.metrics, bot_executor=self.bot_executor, simultaneous=self.simultaneous,
+                      decision_pool=self.decision_pool, config=self.config, memoize=self.memoize)
+
+    def replay(self) -> 'GameState':
+        """Return a fresh game with the same seed and roster, which plays out identically."""
+        return GameState(headless=self.headless, seed=self.seed, roster=self.roster, bitboard=self.bitboard is not None,
+                         log=self.log, metrics=self.metrics, bot_executor=self.bot_executor,
+                         simultaneous=self.simultaneous, decision_pool=self.decision_pool, config=self.config,
+                         memoize=self.memoize)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_decision_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Threads for simultaneous games that don't bring their own decision pool."""
+    # Decisions mostly wait on sleeping or out-of-process bots, so size for a full roster rather than the CPU count
+    return concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix='decide')
+
+
+@functools.lru_cache(maxsize=None)
+def takes_keyword(ai_function: callable, name: str) -> bool:
+    try:
+        return name in inspect.signature(ai_function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def accepts_rng(ai_function: callable) -> bool:
+    """Bots opt in to the game's RNG stream by taking an `rng` keyword argument."""
+    return takes_keyword(ai_function, 'rng')
+
+
+def accepts_perception(ai_function: callable) -> bool:
+    """Bots opt in to the shared per-turn Perception by taking a `perception` keyword argument."""
+    return takes_keyword(ai_function, 'perception')
+
+
+def memoizable(ai_function: callable) -> bool:
+    """Bots declared pure have their moves cached; one that takes `rng` can't be, whatever it declares."""
+    return is_pure(ai_function) and not accepts_rng(ai_function)
+
+
+def run_headless_game(max_rounds: Optional[int] = None, seed: Optional[int] = None,
+                      roster: Optional[List[Tuple[str, str, callable]]] = None,
+                      metrics: Optional[Metrics] = None) -> Dict:
+    """Play one game start to finish with no throttle, stdout or CSV output.
+
+    With `metrics`, the results also carry its latency summary under 'metrics'.
+    """
+    results = GameState(headless=True, seed=seed, roster=roster, metrics=metrics).run_to_completion(max_rounds)
+    if metrics is not None:
+        results['metrics'] = metrics.summary()
+    return results
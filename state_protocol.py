@@ -0,0 +1,112 @@
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Fields that never change during a game are only ever sent in full states
+STATIC_FIELDS = ('grid_size', 'end_game_turns')
+ENGINEER_STATIC_FIELDS = ('name',)
+
+
+def diff_states(old: Dict, new: Dict) -> Tuple[Dict, Dict]:
+    """Top-level fields that changed, plus changed fields per engineer index."""
+    changed = {
+        key: value for key, value in new.items()
+        if key != 'engineers' and key not in STATIC_FIELDS and old.get(key) != value
+    }
+    engineers = {}
+    for index, (before, after) in enumerate(zip(old['engineers'], new['engineers'])):
+        fields = {
+            key: value for key, value in after.items()
+            if key not in ENGINEER_STATIC_FIELDS and before.get(key) != value
+        }
+        if fields:
+            engineers[str(index)] = fields
+    return changed, engineers
+
+
+class StateHistory:
+    """Versioned snapshots of one game, for full and delta-encoded state responses.
+
+    A snapshot is taken at most once per GameState.version and its JSON
+    encoding is cached, so any number of pollers (and the SSE stream) at the
+    same version share one to_dict() and one json.dumps(). Deltas are computed
+    against the snapshot the client last received, which is kept for the last
+    `depth` versions that were served; older clients get a full state.
+
+    Snapshots are never mutated once taken. The methods taking a game_state
+    read the live game and must be called by whoever may step it; the
+    `latest_*` methods only read the newest snapshot and are safe from any
+    thread while the game advances.
+    """
+
+    def __init__(self, depth: int = 64):
+        self.depth = depth
+        self.lock = threading.Lock()
+        self.game = None
+        self.token = ''
+        self.version = None
+        self.snapshots: 'OrderedDict[int, Dict]' = OrderedDict()
+        self.encoded: Dict[Optional[int], bytes] = {}
+
+    def sync(self, game_state) -> Dict:
+        with self.lock:
+            if game_state is not self.game:
+                # A new game (e.g. after /reset) restarts versions, so it gets a new token
+                self.game = game_state
+                self.token = secrets.token_hex(4)
+                self.snapshots.clear()
+                self.encoded.clear()
+            version = game_state.version
+            snapshot = self.snapshots.get(version)
+            if snapshot is None:
+                snapshot = game_state.to_dict()
+                self.snapshots[version] = snapshot
+                if len(self.snapshots) > self.depth:
+                    self.snapshots.popitem(last=False)
+                self.encoded.clear()
+            self.version = version
+            return snapshot
+
+    def etag(self, game_state) -> str:
+        self.sync(game_state)
+        return self.latest_etag()
+
+    def full(self, game_state) -> Dict:
+        self.sync(game_state)
+        return self.latest_full()
+
+    def full_bytes(self, game_state) -> bytes:
+        return self.response_bytes(game_state, None, self.token)
+
+    def response_bytes(self, game_state, since: Optional[int], game: Optional[str]) -> bytes:
+        """Encoded full state, or only what changed after `since` when the client's game still matches."""
+        self.sync(game_state)
+        return self.latest_bytes(since, game)
+
+    def latest_etag(self) -> str:
+        with self.lock:
+            return f'{self.token}-{self.version}'
+
+    def latest_full(self) -> Dict:
+        with self.lock:
+            return {'game': self.token, 'version': self.version, 'delta': False, **self.snapshots[self.version]}
+
+    def latest_bytes(self, since: Optional[int], game: Optional[str]) -> bytes:
+        with self.lock:
+            version = self.version
+            snapshot = self.snapshots[version]
+            if game != self.token or since not in self.snapshots or since > version:
+                since = None
+            body = self.encoded.get(since)
+            if body is None:
+                if since is None:
+                    response = {'game': self.token, 'version': version, 'delta': False, **snapshot}
+                else:
+                    changed, engineers = diff_states(self.snapshots[since], snapshot)
+                    response = {'game': self.token, 'version': version, 'since': since, 'delta': True,
+                                'changed': changed, 'engineers': engineers}
+                body = json.dumps(response).encode()
+                self.encoded[since] = body
+            return body
@@ -0,0 +1,284 @@
+import argparse
+import concurrent.futures
+import dataclasses
+import glob
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import random
+import statistics
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, get_args, get_origin
+
+import bot_cache
+from game_config import DEFAULT_CONFIG, GameConfig
+from simulation import DEFAULT_ROSTER, GameState
+
+DEFAULT_CACHE_DIR = 'sweep_cache'
+# Pure bots' memoized moves, kept in the cache dir between memoized sweeps
+BOT_MOVES_FILE = 'bot_moves.pickle'
+# Games per worker task; small enough to spread one config over the pool, large enough to amortise the hand-off
+CHUNK_SIZE = 50
+# Modules whose code decides how a game plays out, besides the bots' own; editing any of them retires cached points
+ENGINE_MODULES = ('simulation', 'game_config', 'perception', 'threat_field', 'bitboard', 'bot_registry', 'bot_cache')
+
+
+def code_version(module_names: Iterable[str]) -> str:
+    """A short hash of the given modules' source files."""
+    digest = hashlib.sha1()
+    for name in sorted(set(module_names)):
+        with open(importlib.import_module(name).__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:8]
+
+
+def grid_points(base: GameConfig = DEFAULT_CONFIG, **axes: Sequence) -> List[GameConfig]:
+    """Every combination of the given values, e.g. grid_points(beast_detection_radius=[3, 4, 5], end_game_turns=[40, 50])."""
+    names = list(axes)
+    return [base.replace(**dict(zip(names, values))) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_points(num_points: int, base: GameConfig = DEFAULT_CONFIG, seed: int = 0, **ranges) -> List[GameConfig]:
+    """Random configs. Each range is an inclusive (low, high) pair of ints, or a list of values to choose from."""
+    rng = random.Random(seed)
+    points = []
+    for _ in range(num_points):
+        changes = {}
+        for name, choices in ranges.items():
+            if isinstance(choices, tuple) and len(choices) == 2 and all(isinstance(v, int) for v in choices):
+                changes[name] = rng.randint(*choices)
+            else:
+                changes[name] = rng.choice(list(choices))
+        points.append(base.replace(**changes))
+    return points
+
+
+def play_chunk(config: GameConfig, roster: List[Tuple], seeds: range, memoize: bool = False,
+               moves_path: Optional[str] = None) -> List[Dict]:
+    # Only what the summary needs goes back over the pipe
+    results = [
+        {key: result[key] for key in ('scores', 'zombie_order', 'turns')}
+        for result in (GameState(headless=True, seed=seed, roster=roster, config=config, memoize=memoize)
+                       .run_to_completion() for seed in seeds)
+    ]
+    if moves_path is not None:
+        # One file per worker, so workers never overwrite each other; Sweep.run merges them afterwards
+        bot_cache.save_caches(f'{moves_path}.{os.getpid()}')
+    return results
+
+
+def worker_moves(moves_path: str) -> List[str]:
+    return [path for path in glob.glob(f'{glob.escape(moves_path)}.*') if not path.endswith('.tmp')]
+
+
+def summarize(config: GameConfig, results: List[Dict]) -> Dict:
+    """Survival rate and score distribution per bot over one config's games."""
+    bots = {}
+    for name in results[0]['scores']:
+        scores = sorted(result['scores'][name] for result in results)
+        quartiles = statistics.quantiles(scores, n=4) if len(scores) > 1 else scores * 3
+        bots[name] = {
+            'survival_rate': sum(name not in result['zombie_order'] for result in results) / len(results),
+            'mean': statistics.fmean(scores),
+            'stdev': statistics.pstdev(scores),
+            'min': scores[0],
+            'p25': quartiles[0],
+            'median': quartiles[1],
+            'p75': quartiles[2],
+            'max': scores[-1],
+        }
+    return {
+        'config': config.to_dict(),
+        'config_hash': config.config_hash,
+        'games': len(results),
+        'mean_turns': statistics.fmean(result['turns'] for result in results),
+        'bots': bots,
+    }
+
+
+class Sweep:
+    """Runs configs across a process pool, caching each point's summary on disk.
+
+    A point's cache key is its config hash plus the roster, game count and
+    first seed, so re-running or extending a sweep only plays configs it
+    hasn't seen. Every config plays seeds seed .. seed + games - 1, so
+    points differ only by their rules.
+
+    With `memoize`, pure bots answer repeated states from bot_cache. Each
+    worker starts from the moves saved in the cache dir by earlier sweeps,
+    and the sweep saves what its workers learned there when it finishes.
+    """
+
+    def __init__(self, games_per_point: int = 200, seed: int = 0, roster: Optional[List[Tuple]] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_workers: Optional[int] = None,
+                 memoize: bool = False):
+        self.games_per_point = games_per_point
+        self.seed = seed
+        self.roster = list(roster) if roster is not None else DEFAULT_ROSTER
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.memoize = memoize
+        self.moves_path = os.path.join(cache_dir, BOT_MOVES_FILE) if memoize and cache_dir else None
+        roster_key = ','.join(f'{name}:{fn.__module__}.{fn.__qualname__}' for name, _, fn in self.roster)
+        self.roster_hash = hashlib.sha1(roster_key.encode()).hexdigest()[:8]
+        # Same config, roster and seeds can still play out differently once the engine or a bot changes
+        self.code_hash = code_version(ENGINE_MODULES + tuple(fn.__module__ for _, _, fn in self.roster))
+
+    def cache_path(self, config: GameConfig) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        name = f'{config.config_hash}-{self.roster_hash}-{self.code_hash}-{self.games_per_point}-{self.seed}.json'
+        return os.path.join(self.cache_dir, name)
+
+    def cached(self, config: GameConfig) -> Optional[Dict]:
+        path = self.cache_path(config)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def store(self, config: GameConfig, summary: Dict):
+        path = self.cache_path(config)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write then rename, so an interrupted sweep never leaves a half-written point behind
+        with open(path + '.tmp', 'w') as f:
+            json.dump(summary, f)
+        os.replace(path + '.tmp', path)
+
+    def run(self, configs: Iterable[GameConfig]) -> List[Dict]:
+        """One summary per distinct config, in the order given."""
+        configs = list(dict.fromkeys(configs))
+        summaries = {config: self.cached(config) for config in configs}
+        pending = [config for config in configs if summaries[config] is None]
+        if pending:
+            if self.moves_path is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                initializer, initargs = bot_cache.load_caches, (self.moves_path,)
+            else:
+                initializer, initargs = None, ()
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers, initializer=initializer,
+                                                        initargs=initargs) as pool:
+                futures = {}
+                for config in pending:
+                    for start in range(self.seed, self.seed + self.games_per_point, CHUNK_SIZE):
+                        seeds = range(start, min(start + CHUNK_SIZE, self.seed + self.games_per_point))
+                        futures[pool.submit(play_chunk, config, self.roster, seeds, self.memoize,
+                                            self.moves_path)] = (config, start)
+                chunks: Dict[GameConfig, Dict[int, List[Dict]]] = {config: {} for config in pending}
+                for future in concurrent.futures.as_completed(futures):
+                    config, start = futures[future]
+                    chunks[config][start] = future.result()
+                    if len(chunks[config]) * CHUNK_SIZE >= self.games_per_point:
+                        # Every chunk is in; summarise in seed order and cache before the rest finish
+                        results = [game for _, part in sorted(chunks[config].items()) for game in part]
+                        summaries[config] = summarize(config, results)
+                        self.store(config, summaries[config])
+            if self.moves_path is not None:
+                self.merge_moves()
+        return [summaries[config] for config in configs]
+
+
+    def merge_moves(self):
+        """Fold the workers' saved moves into the sweep's moves file, without touching this process's caches."""
+        parts = worker_moves(self.moves_path)
+        bot_cache.merge_saved(self.moves_path, parts)
+        for path in parts:
+            os.remove(path)
+
+
+def print_summary(summary: Dict, base: GameConfig = DEFAULT_CONFIG):
+    changed = {key: value for key, value in summary['config'].items() if value != getattr(base, key)
+               and not (isinstance(value, list) and tuple(value) == getattr(base, key))}
+    print(f"{summary['config_hash']} {changed or 'defaults'}: {summary['games']} games, "
+          f"{summary['mean_turns']:.1f} turns on average")
+    for name, bot in sorted(summary['bots'].items(), key=lambda item: -item[1]['mean']):
+        print(f"  {name:<16} survival {bot['survival_rate']:>6.1%}  score {bot['mean']:5.2f} ± {bot['stdev']:4.2f}  "
+              f"[{bot['min']}, {bot['p25']:g}, {bot['median']:g}, {bot['p75']:g}, {bot['max']}]")
+
+
+# GameConfig's fields by name, with their annotated types
+CONFIG_FIELDS = {field.name: field.type for field in dataclasses.fields(GameConfig)}
+
+
+def parse_value(text: str, field_type):
+    """A CLI value converted to a GameConfig field's type: an int, true/false, or a list like [6,8,10]."""
+    if not text:
+        raise ValueError('empty value')
+    if field_type is bool:
+        if text.lower() not in ('true', 'false'):
+            raise ValueError(f'expected true or false, not {text!r}')
+        return text.lower() == 'true'
+    if field_type is int:
+        try:
+            return int(text)
+        except ValueError:
+            raise ValueError(f'expected an integer, not {text!r}') from None
+    if get_origin(field_type) is tuple:
+        items = get_args(field_type)
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = None
+        if (not isinstance(value, list) or len(value) != len(items)
+                or not all(type(item) is int for item in value)):
+            raise ValueError(f'expected a list of {len(items)} integers like [6,8,10], not {text!r}')
+        return value
+    raise ValueError(f'unsupported field type {field_type}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play many games per rule set and compare the bots.')
+    parser.add_argument('--axis', action='append', default=[], metavar='FIELD=V1,V2,...',
+                        help='grid search over these values; repeat for more fields')
+    parser.add_argument('--range', action='append', default=[], metavar='FIELD=LOW:HIGH',
+                        help='random search over this inclusive integer range; use with --points')
+    parser.add_argument('--points', type=int, default=10, help='random configs to try with --range')
+    parser.add_argument('--games', type=int, default=200, help='games per config')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--json', help='also write the summaries to this file')
+    parser.add_argument('--memoize', action='store_true',
+                        help=f'memoize pure bots, keeping their moves in {BOT_MOVES_FILE} under the cache dir')
+    args = parser.parse_args()
+
+    def field_name(spec: str) -> Tuple[str, str]:
+        name, _, values = spec.partition('=')
+        if name not in CONFIG_FIELDS:
+            parser.error(f'unknown GameConfig field {name!r}')
+        return name, values
+
+    axes = {}
+    for spec in args.axis:
+        name, values = field_name(spec)
+        # beast_movement values are lists like [6,8,10], so split on ';' when one is given
+        try:
+            separator = ';' if '[' in values else ','
+            axes[name] = [parse_value(value, CONFIG_FIELDS[name]) for value in values.split(separator)]
+        except ValueError as error:
+            parser.error(f'--axis {spec}: {error}')
+    ranges = {}
+    for spec in args.range:
+        name, values = field_name(spec)
+        if CONFIG_FIELDS[name] is not int:
+            parser.error(f'--range {spec}: {name} is not an integer field; use --axis')
+        low, _, high = values.partition(':')
+        try:
+            ranges[name] = (int(low), int(high))
+        except ValueError:
+            parser.error(f'--range {spec}: expected LOW:HIGH integers')
+
+    configs = grid_points(**axes) if axes else [DEFAULT_CONFIG]
+    if ranges:
+        configs = [point for base in configs for point in random_points(args.points, base, args.seed, **ranges)]
+
+    summaries = Sweep(args.games, args.seed, cache_dir=args.cache_dir, max_workers=args.workers,
+                      memoize=args.memoize).run(configs)
+    for summary in summaries:
+        print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summaries, f, indent=2)
@@ -0,0 +1,38 @@
+import bot_cache
+from game_config import DEFAULT_CONFIG
+from simulation import GameState
+from sweep import BOT_MOVES_FILE, Sweep
+
+
+def play(seed: int, memoize: bool):
+    game = GameState(headless=True, seed=seed, memoize=memoize)
+    game.run_to_completion()
+    return game.results(), list(game.zombie_order)
+
+
+def test_memoized_games_play_out_the_same():
+    bot_cache.clear_caches()
+    try:
+        # The second memoized pass answers from the cache the first one filled
+        for _ in range(2):
+            for seed in range(20):
+                assert play(seed, memoize=True) == play(seed, memoize=False)
+        assert sum(stats['hits'] for stats in bot_cache.cache_stats().values()) > 0
+    finally:
+        bot_cache.clear_caches()
+
+
+def test_sweep_merges_worker_moves_without_clearing_the_callers_caches(tmp_path):
+    bot_cache.clear_caches()
+    try:
+        play(0, memoize=True)
+        before = bot_cache.cache_stats()
+        Sweep(games_per_point=10, cache_dir=str(tmp_path), max_workers=2, memoize=True).run([DEFAULT_CONFIG])
+        assert bot_cache.cache_stats() == before
+        # The workers' own files are merged in and removed
+        assert sorted(path.name for path in tmp_path.iterdir() if not path.name.endswith('.json')) == [BOT_MOVES_FILE]
+
+        bot_cache.clear_caches()
+        assert bot_cache.load_caches(str(tmp_path / BOT_MOVES_FILE)) > 0
+    finally:
+        bot_cache.clear_caches()
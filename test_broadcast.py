@@ -0,0 +1,41 @@
+import threading
+import time
+
+from broadcast import Broadcaster
+
+
+def publisher_time_per_tick(spectators: int, ticks: int = 50) -> float:
+    broadcaster = Broadcaster()
+    received = [0] * spectators
+
+    def spectate(slot: int):
+        for message in broadcaster.subscribe(keepalive=1.0):
+            if message is not None:
+                received[slot] += 1
+
+    threads = [threading.Thread(target=spectate, args=(slot,), daemon=True) for slot in range(spectators)]
+    for thread in threads:
+        thread.start()
+    while broadcaster.subscribers < spectators:
+        time.sleep(0.01)
+    payload = b'{"turn": 0}' * 100
+    spent = 0.0
+    for _ in range(ticks):
+        # Every spectator is back waiting before the next frame, as with a real tick interval
+        deadline = time.monotonic() + 5
+        while min(received) < broadcaster.sequence and time.monotonic() < deadline:
+            time.sleep(0.001)
+        start = time.thread_time()
+        broadcaster.publish(payload)
+        spent += time.thread_time() - start
+    broadcaster.close()
+    for thread in threads:
+        thread.join()
+    assert min(received) >= ticks - 1
+    return spent / ticks
+
+
+def test_publish_cost_does_not_grow_with_spectators():
+    one = min(publisher_time_per_tick(1) for _ in range(3))
+    many = min(publisher_time_per_tick(500) for _ in range(3))
+    assert many < 5 * max(one, 5e-6), (one, many)
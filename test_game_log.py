@@ -0,0 +1,19 @@
+import copy
+
+from game_log import EventLogger
+from simulation import GameState
+
+
+def test_chase_records_do_not_change_after_later_turns():
+    log = EventLogger.ring(capacity=100000)
+    game = GameState(headless=True, seed=3, log=log)
+    sink = log.sinks[0]
+    chases = {}
+    while not game.game_over:
+        game.step()
+        for record in sink.records:
+            if record[2] == 'chase' and id(record) not in chases:
+                chases[id(record)] = (record, copy.deepcopy(record[3]))
+    assert chases
+    for record, fields_when_emitted in chases.values():
+        assert record[3] == fields_when_emitted
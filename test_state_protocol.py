@@ -0,0 +1,93 @@
+import copy
+import json
+
+import app as server
+import outputs
+from simulation import GameState
+from state_protocol import StateHistory
+
+
+def wire(state):
+    """A state as a client decodes it, tuples having become lists."""
+    return json.loads(json.dumps(state))
+
+
+def apply_delta(state, response):
+    state = copy.deepcopy(state)
+    state.update(response['changed'])
+    for index, fields in response['engineers'].items():
+        state['engineers'][int(index)].update(fields)
+    return state
+
+
+def test_deltas_rebuild_the_full_state_from_any_kept_version():
+    game = GameState(headless=True, seed=5)
+    history = StateHistory(depth=8)
+    received = {}  # version -> full state a client holds
+    while not game.game_over:
+        history.sync(game)
+        received[game.version] = wire(game.to_dict())
+        game.step()
+        for since, state in list(received.items()):
+            response = json.loads(history.response_bytes(game, since, history.token))
+            if since not in history.snapshots:
+                assert response['delta'] is False
+                del received[since]
+                continue
+            assert response['delta'] is True and response['since'] == since
+            assert apply_delta(state, response) == wire(game.to_dict())
+
+
+def test_unknown_game_or_version_gets_the_full_state():
+    game = GameState(headless=True, seed=5)
+    history = StateHistory()
+    history.sync(game)
+    old_version = game.version
+    for _ in range(5):
+        game.step()
+    full = wire({'game': history.token, 'version': game.version, 'delta': False, **game.to_dict()})
+    for since, token in ((old_version, 'not-this-game'), (old_version, None), (10 ** 6, history.token),
+                         (None, history.token)):
+        assert json.loads(history.response_bytes(game, since, token)) == full
+
+    # A reset game gets a new token, so a client still holding the old one is sent everything
+    old_token = history.token
+    game = GameState(headless=True, seed=6)
+    response = json.loads(history.response_bytes(game, old_version, old_token))
+    assert response['delta'] is False and response['game'] != old_token
+
+
+def test_unchanged_version_is_not_modified():
+    client = server.app.test_client()
+    session_id = client.post('/games', json={'seed': 1}).get_json()['session_id']
+    first = client.get(f'/games/{session_id}/state')
+    assert first.status_code == 200 and first.headers['ETag'].startswith('W/')
+    repeat = client.get(f'/games/{session_id}/state', headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304 and repeat.data == b''
+
+    client.post(f'/games/{session_id}/step')
+    after_step = client.get(f'/games/{session_id}/state', headers={'If-None-Match': first.headers['ETag']})
+    assert after_step.status_code == 200
+    assert after_step.headers['ETag'] != first.headers['ETag']
+    assert after_step.get_json()['version'] > first.get_json()['version']
+
+
+def test_evicted_finished_game_is_served_from_the_archive(tmp_path, monkeypatch):
+    # The finished game is recorded; keep that out of the working directory
+    monkeypatch.setattr(outputs, '_store', outputs.ResultsStore(str(tmp_path / 'results.jsonl'), legacy_csv=None))
+    client = server.app.test_client()
+    session_id = client.post('/games', json={'seed': 2}).get_json()['session_id']
+    final = client.post(f'/games/{session_id}/step?to_end=1').get_json()
+    assert final['game_over']
+
+    monkeypatch.setattr(server.sessions, 'archive_dir', str(tmp_path))
+    monkeypatch.setattr(server.sessions, 'idle_timeout', -1.0)
+    server.sessions.get(session_id)  # any lookup evicts every idle session
+    assert server.sessions.get(session_id) is None
+
+    archived = client.get(f'/games/{session_id}/state')
+    assert archived.status_code == 200
+    body = archived.get_json()
+    assert body['archived'] is True and body['session_id'] == session_id
+    assert body['zombie_order'] == final['zombie_order']
+    assert client.get('/games/no-such-game/state').status_code == 404
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from game_config import neighbor_cells
+from threat_field import NUMPY_MIN_CELLS, ThreatField
+
+
+@pytest.mark.parametrize('width, height', [(12, 10), (7, 3), (1, 9), (32, 32)])
+@pytest.mark.parametrize('seed', range(5))
+def test_repaired_field_matches_a_rebuild(width, height, seed):
+    rng = random.Random(seed)
+    neighbors = neighbor_cells(width, height)
+    cells = list(neighbors)
+    threats = [rng.choice(cells) for _ in range(rng.randint(1, 4))]
+    field = ThreatField(width, height, threats)
+    assert field.use_numpy == (width * height >= NUMPY_MIN_CELLS)
+    field.snapshot()
+    for _ in range(200):
+        before = field.snapshot()
+        kept = list(before)
+        if rng.random() < 0.1:
+            threats.append(rng.choice(cells))
+            field.add(threats[-1])
+        else:
+            # A threat steps to a neighbouring cell or stays put, as zombies and the beast do
+            i = rng.randrange(len(threats))
+            old = threats[i]
+            threats[i] = rng.choice(neighbors[old] + (old,))
+            field.move(old, threats[i])
+        expected = ThreatField(width, height, threats)
+        expected.rebuild()
+        assert list(field.snapshot()) == list(expected.steps)
+        # Snapshots already handed out never change under a repair
+        assert list(before) == kept
+    assert field.repairs == 200 and field.rebuilds == 1
@@ -0,0 +1,236 @@
+import functools
+from collections import Counter, defaultdict
+from typing import Iterable, Sequence, Tuple
+
+from game_config import neighbor_cells
+
+Position = Tuple[int, int]
+
+# Arenas at least this big compute the field as NumPy L1 distances rather than a breadth-first search
+NUMPY_MIN_CELLS = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def neighbor_indices(width: int, height: int) -> Tuple[Tuple[int, ...], ...]:
+    """neighbor_cells as flat cell indices, y * width + x, so the field can be a plain list."""
+    cells = neighbor_cells(width, height)
+    return tuple(
+        tuple(nx + ny * width for nx, ny in cells[(x, y)])
+        for y in range(height) for x in range(width)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def cell_coordinates(width: int, height: int):
+    import numpy as np
+
+    # Narrow ints where they fit, as the field is bandwidth-bound on big arenas
+    dtype = np.int16 if width + height < 2 ** 15 else np.int32
+    ys, xs = np.divmod(np.arange(width * height, dtype=np.int32), width)
+    return xs.astype(dtype), ys.astype(dtype)
+
+
+class ThreatField:
+    """Steps from every cell to the nearest threat, kept current as threats move.
+
+    The field is read as a flat sequence indexed by y * width + x; a cell
+    with no threat anywhere holds width + height, further than any real
+    distance. Reading it is free while no threat has moved. After a threat
+    steps to a neighbouring cell or a new zombie appears, the field is
+    repaired in place rather than rebuilt: only the cells whose nearest
+    threat changed are touched. Nothing is computed until the field is
+    first read, and a field nobody read since the last change is dropped
+    rather than repaired.
+
+    Small grids use a multi-source breadth-first search. Arenas of
+    NUMPY_MIN_CELLS cells or more, where that gets slow in Python, take
+    L1 distances with NumPy instead; on an open grid the two are equal.
+    """
+
+    def __init__(self, width: int, height: int, threats: Iterable[Position] = ()):
+        self.width = width
+        self.height = height
+        self.unreached = width + height
+        self.use_numpy = width * height >= NUMPY_MIN_CELLS
+        # Threat count per cell index; several zombies can share a cell
+        self.sources = Counter(x + y * width for x, y in threats)
+        self.steps = None
+        self._snapshot = None
+        # Whether the field was read since it last changed, which makes it worth repairing
+        self.read = False
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def move(self, old: Position, new: Position):
+        old_index = old[0] + old[1] * self.width
+        new_index = new[0] + new[1] * self.width
+        self.sources[old_index] -= 1
+        if not self.sources[old_index]:
+            del self.sources[old_index]
+        self.sources[new_index] += 1
+        if self.changed():
+            self.add_source(new_index)
+            if old_index not in self.sources:
+                self.remove_source(old_index)
+
+    def add(self, position: Position):
+        index = position[0] + position[1] * self.width
+        self.sources[index] += 1
+        if self.changed():
+            self.add_source(index)
+
+    def reset(self, threats: Iterable[Position]):
+        self.sources = Counter(x + y * self.width for x, y in threats)
+        self.steps = self._snapshot = None
+
+    def changed(self) -> bool:
+        """Drop the snapshot; True if the field should be repaired now, False if it was dropped too."""
+        self._snapshot = None
+        if self.steps is None:
+            return False
+        if not self.read:
+            self.steps = None
+            return False
+        self.read = False
+        self.repairs += 1
+        return True
+
+    def snapshot(self) -> Sequence[int]:
+        """The current field, read-only: a tuple, or a non-writeable NumPy array on large arenas."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            if self.steps is None:
+                self.rebuild()
+            if self.use_numpy:
+                snapshot = self.steps
+                snapshot.setflags(write=False)
+            else:
+                snapshot = tuple(self.steps)
+            self._snapshot = snapshot
+        self.read = True
+        return snapshot
+
+    def steps_from(self, position: Position) -> int:
+        return int(self.snapshot()[position[0] + position[1] * self.width])
+
+    def rebuild(self):
+        self.rebuilds += 1
+        if self.use_numpy:
+            self.steps = self.l1_field(self.sources)
+            return
+        neighbors = neighbor_indices(self.width, self.height)
+        steps = [self.unreached] * (self.width * self.height)
+        frontier = list(self.sources)
+        for index in frontier:
+            steps[index] = 0
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            for index in frontier:
+                for neighbor in neighbors[index]:
+                    if steps[neighbor] > distance:
+                        steps[neighbor] = distance
+                        reached.append(neighbor)
+            frontier = reached
+        self.steps = steps
+
+    def l1_field(self, sources: Iterable[int], cells=None):
+        import numpy as np
+
+        xs, ys = cell_coordinates(self.width, self.height)
+        if cells is not None:
+            xs, ys = xs[cells], ys[cells]
+        field = np.full(len(xs), self.unreached, dtype=xs.dtype)
+        for index in sources:
+            sy, sx = divmod(index, self.width)
+            np.minimum(field, np.abs(xs - sx) + np.abs(ys - sy), out=field)
+        return field
+
+    def add_source(self, index: int):
+        """Lower the cells now nearer to the threat at `index` than to any other."""
+        steps = self.steps
+        if self.use_numpy:
+            import numpy as np
+
+            sy, sx = divmod(index, self.width)
+            xs, ys = cell_coordinates(self.width, self.height)
+            # A new array, so snapshots already handed out keep their values
+            self.steps = np.minimum(steps, np.abs(xs - sx) + np.abs(ys - sy))
+            return
+        if steps[index] == 0:
+            return
+        neighbors = neighbor_indices(self.width, self.height)
+        steps[index] = 0
+        frontier = [index]
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            for cell in frontier:
+                for neighbor in neighbors[cell]:
+                    if steps[neighbor] > distance:
+                        steps[neighbor] = distance
+                        reached.append(neighbor)
+            frontier = reached
+
+    def remove_source(self, index: int):
+        """Raise the cells whose every shortest path led to the threat that left `index`."""
+        if self.use_numpy:
+            import numpy as np
+
+            xs, ys = cell_coordinates(self.width, self.height)
+            sy, sx = divmod(index, self.width)
+            # Only cells as near to the old cell as to any threat can have depended on it
+            stale = np.flatnonzero(self.steps == np.abs(xs - sx) + np.abs(ys - sy))
+            steps = self.steps.copy()
+            steps[stale] = self.l1_field(self.sources, stale)
+            self.steps = steps
+            return
+        steps = self.steps
+        neighbors = neighbor_indices(self.width, self.height)
+        # Walk outwards level by level; a cell is orphaned once all its parents, one step nearer, are
+        orphaned = {index}
+        level = [index]
+        distance = 0
+        while level:
+            distance += 1
+            reached = []
+            for cell in level:
+                for neighbor in neighbors[cell]:
+                    if steps[neighbor] != distance or neighbor in orphaned:
+                        continue
+                    for parent in neighbors[neighbor]:
+                        if steps[parent] == distance - 1 and parent not in orphaned:
+                            break
+                    else:
+                        orphaned.add(neighbor)
+                        reached.append(neighbor)
+            level = reached
+
+        # Re-seed the orphans from the cells around them that kept a path, then relax nearest first
+        unreached = self.unreached
+        buckets = defaultdict(list)
+        for cell in orphaned:
+            best = unreached
+            for neighbor in neighbors[cell]:
+                if steps[neighbor] + 1 < best and neighbor not in orphaned:
+                    best = steps[neighbor] + 1
+            steps[cell] = best
+            buckets[best].append(cell)
+        distance, last = min(buckets), max(buckets)
+        while distance <= last:
+            for cell in buckets.pop(distance, ()):
+                if steps[cell] != distance:
+                    continue
+                for neighbor in neighbors[cell]:
+                    if steps[neighbor] > distance + 1 and neighbor in orphaned:
+                        steps[neighbor] = distance + 1
+                        buckets[distance + 1].append(neighbor)
+                        last = max(last, distance + 1)
+            distance += 1
+
+
+def threat_field(width: int, height: int, threats: Iterable[Position]) -> Sequence[int]:
+    """A one-off field for the given threats."""
+    return ThreatField(width, height, threats).snapshot()
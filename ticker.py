@@ -0,0 +1,131 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+
+from sessions import Session, SessionManager
+
+# A game ticking as fast as possible runs this long per visit, so rated games are never held up for longer
+FAST_SLICE = 0.02
+GOLDEN_RATIO = 0.6180339887
+
+
+class TickScheduler:
+    """The single writer for every session with a tick_rate.
+
+    One thread steps each auto-ticking game on its own schedule, takes the
+    snapshot and publishes it to spectators. Request handlers only read the
+    latest snapshot from the session's StateHistory, so polling clients
+    neither change the game speed nor wait on the simulation.
+    """
+
+    def __init__(self, sessions: SessionManager):
+        self.sessions = sessions
+        self.condition = threading.Condition()
+        self.queue: List[Tuple[float, int, Session]] = []  # (due time, tie-breaker, session)
+        self.scheduled: Set[Session] = set()
+        self.counter = itertools.count()
+        self.thread = None
+        self.stopped = False
+        # Ticks that started more than one interval late; the schedule skips ahead instead of bursting
+        self.late_ticks = 0
+        self.max_lag = 0.0  # worst delay between a tick being due and starting, in seconds
+        sessions.listeners.append(self.schedule)
+        for session in sessions.active():
+            self.schedule(session)
+
+    def start(self) -> 'TickScheduler':
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return self
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+
+    def schedule(self, session: Session):
+        """Start ticking an auto-ticking session, e.g. when it is created or reset. Manual sessions are ignored."""
+        if session.tick_rate is None:
+            return
+        with session.lock:
+            # Readers need a snapshot before the first tick
+            session.history.sync(session.game_state)
+        with self.condition:
+            if session in self.scheduled or session.paused:
+                return
+            self.scheduled.add(session)
+            order = next(self.counter)
+            due = time.monotonic()
+            if session.tick_rate:
+                # Spread the phases of games created together, so their ticks don't all land at once
+                due += (order * GOLDEN_RATIO) % 1 / session.tick_rate
+            heapq.heappush(self.queue, (due, order, session))
+            self.condition.notify()
+
+    def pause(self, session: Session):
+        """Stop ticking a session; it leaves the schedule when next due, before stepping."""
+        with self.condition:
+            session.paused = True
+
+    def resume(self, session: Session):
+        with self.condition:
+            session.paused = False
+        self.schedule(session)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    now = time.monotonic()
+                    if self.queue and self.queue[0][0] <= now:
+                        break
+                    self.condition.wait(self.queue[0][0] - now if self.queue else None)
+                if self.stopped:
+                    return
+                due, _, session = heapq.heappop(self.queue)
+                if session.paused:
+                    self.scheduled.discard(session)
+                    continue
+            next_due = self.tick(session, due)
+            with self.condition:
+                if next_due is None:
+                    self.scheduled.discard(session)
+                else:
+                    heapq.heappush(self.queue, (next_due, next(self.counter), session))
+
+    def tick(self, session: Session, due: float) -> Optional[float]:
+        """Advance one session and publish its snapshot. Returns when it is next due, or None to drop it."""
+        self.max_lag = max(self.max_lag, time.monotonic() - due)
+        rate = session.tick_rate
+        if rate is None or session not in self.sessions:
+            return None
+        with session.lock:
+            game_state = session.game_state
+            if rate:
+                running = game_state.step()
+            else:
+                deadline = time.perf_counter() + FAST_SLICE
+                running = True
+                while running and time.perf_counter() < deadline:
+                    running = game_state.step()
+            session.history.sync(game_state)
+            if session.has_spectators():
+                session.spectators.publish(session.history.full_bytes(game_state))
+        if session.has_spectators():
+            self.sessions.touch(session)
+        if not running:
+            return None
+        if not rate:
+            return time.monotonic()
+        next_due = due + 1 / rate
+        now = time.monotonic()
+        if next_due < now:
+            self.late_ticks += 1
+            next_due = now
+        return next_due